@@ -10,7 +10,13 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    # Pulled in through optional code paths of dependencies, never used by the counter
+    excludes=[
+        'setuptools', 'pkg_resources', '_distutils_hack', 'distutils',
+        'multiprocessing', 'psutil', 'numpy', 'cffi', 'pycparser',
+        'unittest', 'doctest', 'pydoc', 'pdb', 'xmlrpc', 'ftplib', 'smtplib',
+        'tkinter.test', 'lib2to3',
+    ],
     noarchive=False,
     optimize=0,
 )
@@ -26,7 +32,7 @@ exe = EXE(
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
+    upx=False, # UPX-packed binaries are unpacked on every launch, which delays the first frame
     upx_exclude=[],
     runtime_tmpdir=None,
     console=False,
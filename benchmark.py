@@ -0,0 +1,389 @@
+"""
+Headless benchmark suite for the Doom Counter window.
+
+Drives DoomCounter and its flip cards under a virtual X server (Xvfb is
+started automatically when there is no DISPLAY) with a mocked wall and
+monotonic clock, so every run replays exactly the same seconds. Timer
+callbacks are invoked directly instead of through Tk's event loop, which
+keeps the measurements free of scheduling noise.
+
+Results are printed as JSON (or written with --output) and two result files
+can be compared with --compare to spot regressions between commits.
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from unittest import mock
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RENDER_MODES = ("widgets", "sprites", "canvas")
+
+
+class FakeClock:
+    """
+    Stands in for time.time, time.monotonic and datetime.now. Starts at a
+    fixed local time and only moves when advance() is called.
+    """
+    def __init__(self, start=datetime(2030, 1, 1, 12, 0, 0, 500000)):
+        self.wall = start.timestamp()
+        self.mono = 1000.0
+
+    def time(self):
+        return self.wall
+
+    def monotonic(self):
+        return self.mono
+
+    def advance(self, seconds):
+        self.wall += seconds
+        self.mono += seconds
+
+    @contextlib.contextmanager
+    def patch(self):
+        """Installs the clock for the duration of a with block."""
+        clock = self
+
+        class FakeDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return datetime.fromtimestamp(clock.wall, tz)
+
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(mock.patch("time.time", self.time))
+            stack.enter_context(mock.patch("time.monotonic", self.monotonic))
+            stack.enter_context(mock.patch("countdown.datetime", FakeDatetime))
+            yield self
+
+
+def start_xvfb():
+    """
+    Starts Xvfb on a free display and points DISPLAY at it.
+    Returns the process, or None when a display is already available.
+    """
+    if os.environ.get("DISPLAY") or sys.platform != "linux":
+        return None
+    read_fd, write_fd = os.pipe()
+    try:
+        process = subprocess.Popen(
+            ["Xvfb", "-displayfd", str(write_fd), "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+            pass_fds=(write_fd,), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+    except FileNotFoundError:
+        sys.exit("No DISPLAY and Xvfb is not installed")
+    os.close(write_fd)
+    display = b""
+    while not display.endswith(b"\n"):
+        chunk = os.read(read_fd, 16)
+        if not chunk:
+            break
+        display += chunk
+    os.close(read_fd)
+    os.environ["DISPLAY"] = f":{display.decode().strip()}"
+    return process
+
+
+def summarize(samples):
+    """Milliseconds statistics for a list of durations in seconds."""
+    ms = sorted(sample * 1000 for sample in samples)
+    return {
+        "n": len(ms),
+        "mean_ms": statistics.fmean(ms),
+        "median_ms": statistics.median(ms),
+        "p95_ms": ms[min(len(ms) - 1, int(len(ms) * 0.95))],
+        "min_ms": ms[0],
+        "max_ms": ms[-1],
+    }
+
+
+class Bench:
+    """
+    One DoomCounter instance under the fake clock, with helpers that run
+    its timer callbacks by hand. Its date file and window positions live in
+    `config_dir`, so the user's own settings are neither read nor changed.
+    """
+    def __init__(self, main, clock, render_mode, config_dir):
+        self.clock = clock
+        self.app = main.DoomCounter(
+            render_mode=render_mode,
+            date_file=os.path.join(config_dir, "doom_date.txt"),
+            watch_date_file=False,
+            window_state_file=os.path.join(config_dir, "windows.json"),
+            keep_history=False
+        )
+        self.app.update()
+        self.app.ticker.stop()
+        self.settle()
+
+    def set_remaining(self, seconds):
+        """Puts the doom date `seconds` after the fake now and snaps the cards to it."""
+        app = self.app
+        app.doom_date = datetime.fromtimestamp(self.clock.time()) + timedelta(seconds=seconds)
+        app.update_display(animate=False)
+        self.settle()
+
+    def settle(self):
+        """Finishes all running flips and pending redraws."""
+        self.drain()
+        self.app.update_idletasks()
+
+    def drain(self, redraw_each_frame=False):
+        """Runs animation frames until no card is flipping; returns the frame count."""
+        driver = self.app.animation_driver
+        frames = 0
+        while driver.active:
+            if driver._job is not None:
+                self.app.after_cancel(driver._job)
+                driver._job = None
+            driver._frame()
+            frames += 1
+            if redraw_each_frame:
+                self.app.update_idletasks()
+        if driver._job is not None:
+            self.app.after_cancel(driver._job)
+            driver._job = None
+        return frames
+
+    def tick(self, redraw=True):
+        """Advances the fake clock one second and runs one full tick with its flips."""
+        self.clock.advance(1)
+        ticker = self.app.ticker
+        ticker._tick()
+        if ticker._job is not None:
+            self.app.after_cancel(ticker._job)
+            ticker._job = None
+        self.drain(redraw_each_frame=redraw)
+        if redraw:
+            self.app.update_idletasks()
+
+    def destroy(self):
+        self.app.destroy()
+
+
+def timed(function, repeat):
+    wall, cpu = [], []
+    for _ in range(repeat):
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        function()
+        wall.append(time.perf_counter() - start_wall)
+        cpu.append(time.process_time() - start_cpu)
+    return {"wall": summarize(wall), "cpu": summarize(cpu)}
+
+
+def bench_flip(bench, repeat):
+    """One card flipping to a new digit, every frame drawn."""
+    card = bench.app.seconds_group.cards[-1]
+    values = iter(str(i % 10) for i in range(1, repeat + 1))
+
+    def flip():
+        card.set_value(next(values))
+        bench.drain(redraw_each_frame=True)
+        bench.app.update_idletasks()
+    return timed(flip, repeat)
+
+
+def bench_tick(bench, repeat, remaining):
+    """One tick starting `remaining` seconds before the doom date, flips included."""
+    samples = {"wall": [], "cpu": []}
+    for _ in range(repeat):
+        bench.set_remaining(remaining)
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        bench.tick()
+        samples["wall"].append(time.perf_counter() - start_wall)
+        samples["cpu"].append(time.process_time() - start_cpu)
+    return {kind: summarize(values) for kind, values in samples.items()}
+
+
+def bench_idle_second(bench, repeat):
+    """A tick where only the last seconds digit changes (the common case)."""
+    return bench_tick(bench, repeat, 10 * 86400 + 5 * 3600 + 30 * 60 + 55.5)
+
+
+def bench_rollover(bench, repeat):
+    """A tick where days, hours, minutes and seconds all flip (10d 00:00:00 -> 09d 23:59:59)."""
+    return bench_tick(bench, repeat, 10 * 86400 + 0.5)
+
+
+def bench_cold_start(repeat, config_dir):
+    """
+    Time to first frame of a fresh process, as reported by --profile-startup,
+    with `config_dir` as its config directory.
+    """
+    env = {key: value for key, value in os.environ.items() if key != "DOOMCOUNTER_DATE_FILE"}
+    env["XDG_CONFIG_HOME"] = env["APPDATA"] = config_dir
+    samples = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, os.path.join(HERE, "main.py"), "--profile-startup", "--no-history"],
+            capture_output=True, text=True, cwd=HERE, env=env, timeout=60
+        )
+        for line in result.stderr.splitlines():
+            if line.strip().startswith("time to first frame"):
+                samples.append(float(line.split()[-1]) / 1000)
+    if not samples:
+        return {"error": "no startup profile reported"}
+    return {"wall": summarize(samples)}
+
+
+def bench_memory(bench, hours, redraw_every=60):
+    """
+    RSS and live object count over `hours` simulated hours of ticking,
+    sampled once per simulated hour.
+    """
+    from metrics import read_rss
+    bench.set_remaining(hours * 3600 + 30 * 86400 + 0.5)
+    gc.collect()
+    samples = [{"hour": 0, "rss_bytes": read_rss(), "objects": len(gc.get_objects())}]
+    start = time.perf_counter()
+    for second in range(1, hours * 3600 + 1):
+        bench.tick(redraw=second % redraw_every == 0)
+        if second % 3600 == 0:
+            gc.collect()
+            samples.append({"hour": second // 3600, "rss_bytes": read_rss(), "objects": len(gc.get_objects())})
+    first, last = samples[0], samples[-1]
+    return {
+        "simulated_hours": hours,
+        "elapsed_s": time.perf_counter() - start,
+        "rss_growth_bytes": (last["rss_bytes"] or 0) - (first["rss_bytes"] or 0),
+        "object_growth": last["objects"] - first["objects"],
+        "samples": samples,
+    }
+
+
+def bench_windows(bench, count):
+    """
+    RSS and time added per extra countdown window, with `count` windows
+    opened next to the main one, and the cost of one tick over all of them.
+    """
+    from metrics import read_rss
+    app = bench.app
+    bench.set_remaining(30 * 86400 + 0.5)
+    gc.collect()
+    rss_before = read_rss()
+    start = time.perf_counter()
+    windows = [app.open_window(app.doom_date + timedelta(hours=i + 1)) for i in range(count)]
+    app.update_idletasks()
+    opened = time.perf_counter() - start
+    app.ticker.stop() # Opening a window restarts the shared ticker; ticks are run by hand
+    gc.collect()
+    rss_after = read_rss()
+    try:
+        tick = timed(bench.tick, 20)
+    finally:
+        for window in windows:
+            window.destroy()
+        app.ticker.stop()
+        bench.settle()
+    return {
+        "windows": count,
+        "open_ms_per_window": opened * 1000 / count,
+        "rss_bytes_per_window": ((rss_after or 0) - (rss_before or 0)) // count,
+        "wall": tick["wall"],
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, cwd=HERE).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run(args):
+    xvfb = start_xvfb()
+    # A fresh config directory per run keeps runs independent of the user's settings and of each other
+    config_dir = tempfile.TemporaryDirectory(prefix="doomcounter-bench-")
+    try:
+        sys.path.insert(0, HERE)
+        import main
+        results = {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "benchmarks": {},
+        }
+        clock = FakeClock()
+        with clock.patch():
+            for mode in args.render:
+                bench = Bench(main, clock, mode, config_dir.name)
+                try:
+                    results["benchmarks"][f"flip[{mode}]"] = bench_flip(bench, args.repeat)
+                    results["benchmarks"][f"idle_second[{mode}]"] = bench_idle_second(bench, args.repeat)
+                    results["benchmarks"][f"rollover[{mode}]"] = bench_rollover(bench, args.repeat)
+                    if args.windows:
+                        results["benchmarks"][f"windows[{mode}]"] = bench_windows(bench, args.windows)
+                    if args.hours:
+                        results["benchmarks"][f"memory[{mode}]"] = bench_memory(bench, args.hours)
+                finally:
+                    bench.destroy()
+        if args.cold_starts:
+            results["benchmarks"]["cold_start"] = bench_cold_start(args.cold_starts, config_dir.name)
+        return results
+    finally:
+        config_dir.cleanup()
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait()
+
+
+def compare(old, new):
+    """
+    Prints the median wall time of every benchmark in both result files and
+    the relative change.
+    """
+    print(f"{'benchmark':<24}{'old ms':>10}{'new ms':>10}{'change':>10}")
+    for name, result in new["benchmarks"].items():
+        before = old["benchmarks"].get(name, {})
+        if "wall" in result and "wall" in before:
+            a, b = before["wall"]["median_ms"], result["wall"]["median_ms"]
+            change = f"{(b - a) / a * 100:+.1f}%" if a else "n/a"
+            print(f"{name:<24}{a:>10.3f}{b:>10.3f}{change:>10}")
+        elif "rss_growth_bytes" in result and "rss_growth_bytes" in before:
+            a, b = before["rss_growth_bytes"] / 2**20, result["rss_growth_bytes"] / 2**20
+            print(f"{name + ' MB':<24}{a:>10.2f}{b:>10.2f}{b - a:>+10.2f}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Doom Counter rendering and ticking")
+    parser.add_argument("--render", nargs="+", choices=RENDER_MODES, default=list(RENDER_MODES),
+                        help="render modes to benchmark")
+    parser.add_argument("--repeat", type=int, default=50, metavar="N",
+                        help="samples per benchmark")
+    parser.add_argument("--hours", type=int, default=24, metavar="H",
+                        help="simulated hours for the memory benchmark, 0 to skip")
+    parser.add_argument("--windows", type=int, default=10, metavar="N",
+                        help="extra countdown windows to open for the per-window cost benchmark, 0 to skip")
+    parser.add_argument("--cold-starts", type=int, default=5, metavar="N",
+                        help="fresh processes to launch for the cold-start benchmark, 0 to skip")
+    parser.add_argument("--output", metavar="FILE", help="write the JSON results to FILE")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"),
+                        help="compare two result files instead of running")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.compare:
+        with open(args.compare[0]) as f_old, open(args.compare[1]) as f_new:
+            compare(json.load(f_old), json.load(f_new))
+        return
+    results = run(args)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,422 @@
+"""
+Countdown logic and deadline bookkeeping for the Doom Counter, kept free of
+any UI code so the window, the terminal renderer and headless tools share
+it, and so it can track hundreds of deadlines while a window only shows a
+handful.
+"""
+import heapq
+import itertools
+import os
+import re
+from datetime import datetime
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+DOOMSDAY_TEXT = "DOOMSDAY!"
+
+
+def remaining_seconds(target, now=None):
+    """
+    Seconds from `now` (default: the current local time) until the naive
+    local datetime `target`; negative once it has passed.
+    Compared as timestamps, so a DST change in between is accounted for.
+    """
+    return target.timestamp() - (now if now is not None else datetime.now()).timestamp()
+
+
+def split_remaining(seconds):
+    """
+    Splits a number of seconds left into (days, hours, minutes, seconds),
+    all zero once the deadline has passed.
+    """
+    if seconds <= 0:
+        return (0, 0, 0, 0)
+    days, remainder = divmod(int(seconds), 86400)
+    hours, remainder = divmod(remainder, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return (days, hours, minutes, seconds)
+
+
+def countdown_values(seconds):
+    """
+    The four card values for a number of seconds left, two digits each
+    (days grow past two digits as needed).
+    """
+    return tuple(f"{part:02d}" for part in split_remaining(seconds))
+
+
+def format_remaining(seconds, show_seconds=True):
+    """
+    Formats a number of seconds left the way the counter shows it.
+    """
+    if seconds <= 0:
+        return DOOMSDAY_TEXT
+    days, hours, minutes, secs = countdown_values(seconds)
+    if not show_seconds:
+        return f"{days}d {hours}:{minutes}"
+    return f"{days}d {hours}:{minutes}:{secs}"
+
+
+def parse_offset(text):
+    """
+    Parses an alarm threshold such as "T-24h", "1h30m", "90s", "2d" or
+    "0" / "zero" into seconds before the deadline.
+    """
+    spec = text.strip().lower()
+    if spec.startswith("t-"):
+        spec = spec[2:]
+    if spec in ("0", "zero", "at zero"):
+        return 0
+    if spec.isdigit():
+        return int(spec)
+    # Every number needs a unit: "1h30" is rejected rather than read as 1h
+    if not re.fullmatch(r"(\d+\s*[dhms]\s*)+", spec):
+        raise ValueError(f"Invalid alarm threshold: {text!r}")
+    parts = re.findall(r"(\d+)\s*([dhms])", spec)
+    units = {"d": 86400, "h": 3600, "m": 60, "s": 1}
+    return sum(int(amount) * units[unit] for amount, unit in parts)
+
+
+def format_offset(seconds):
+    """
+    The inverse of parse_offset, used to label alarms ("T-1h", "zero").
+    """
+    if seconds <= 0:
+        return "zero"
+    text = ""
+    for unit, size in (("d", 86400), ("h", 3600), ("m", 60), ("s", 1)):
+        amount, seconds = divmod(seconds, size)
+        if amount:
+            text += f"{amount}{unit}"
+    return f"T-{text}"
+
+
+class Deadline:
+    """
+    A named point in time tracked by a CountdownEngine.
+    """
+    __slots__ = ("id", "name", "when", "timestamp", "_seq")
+
+    def __init__(self, deadline_id, name, when):
+        self.id = deadline_id
+        self.name = name
+        self.when = when
+        self.timestamp = when.timestamp()
+        self._seq = None # Heap entry that currently represents this deadline
+
+    def remaining(self, now):
+        """Seconds left at timestamp `now` (negative once passed)."""
+        return self.timestamp - now
+
+    def __repr__(self):
+        return f"Deadline({self.id}, {self.name!r}, {self.when.strftime(DATE_FORMAT)})"
+
+
+class CountdownEngine:
+    """
+    Keeps any number of deadlines in a min-heap ordered by due time.
+
+    The cost of a refresh scales with what is displayed, not with how many
+    deadlines are loaded: next_n walks only the top of the heap, and
+    remaining time is computed only for the deadlines handed back.
+    Removing or rescheduling leaves a stale heap entry behind that is
+    skipped when reached and dropped when the heap is compacted.
+    """
+    def __init__(self):
+        self._heap = [] # (timestamp, seq, deadline id)
+        self._deadlines = {}
+        self._ids = itertools.count(1)
+        self._seqs = itertools.count()
+        self._stale = 0
+        # Deadlines that have passed, in the order they expired
+        self.expired = []
+
+    def __len__(self):
+        return len(self._deadlines)
+
+    def __contains__(self, deadline_id):
+        return deadline_id in self._deadlines
+
+    def get(self, deadline_id):
+        return self._deadlines.get(deadline_id)
+
+    def add(self, name, when):
+        """
+        Starts tracking a deadline and returns it.
+        """
+        deadline = Deadline(next(self._ids), name, when)
+        self._deadlines[deadline.id] = deadline
+        self._push(deadline)
+        return deadline
+
+    def remove(self, deadline_id):
+        deadline = self._deadlines.pop(deadline_id, None)
+        if deadline is not None:
+            self._mark_stale()
+        return deadline
+
+    def reschedule(self, deadline_id, when):
+        """
+        Moves a deadline to a new due time.
+        """
+        deadline = self._deadlines[deadline_id]
+        deadline.when = when
+        deadline.timestamp = when.timestamp()
+        self._push(deadline)
+        self._mark_stale()
+        return deadline
+
+    def _push(self, deadline):
+        deadline._seq = next(self._seqs)
+        heapq.heappush(self._heap, (deadline.timestamp, deadline._seq, deadline.id))
+
+    def _live(self, entry):
+        deadline = self._deadlines.get(entry[2])
+        return deadline if deadline is not None and deadline._seq == entry[1] else None
+
+    def _mark_stale(self):
+        self._stale += 1
+        # Rebuild once stale entries outnumber live ones, keeping pushes and walks cheap
+        if self._stale > 64 and self._stale > len(self._deadlines):
+            self._heap = [(d.timestamp, d._seq, d.id) for d in self._deadlines.values()]
+            heapq.heapify(self._heap)
+            self._stale = 0
+
+    def peek(self):
+        """
+        Returns the deadline due soonest, or None when nothing is tracked.
+        """
+        while self._heap:
+            deadline = self._live(self._heap[0])
+            if deadline is not None:
+                return deadline
+            heapq.heappop(self._heap)
+            self._stale -= 1
+        return None
+
+    def expire(self, now):
+        """
+        Moves every deadline due at or before timestamp `now` to `expired`
+        and returns the newly expired ones in due order.
+        """
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            deadline = self._live(entry)
+            if deadline is None:
+                self._stale -= 1
+                continue
+            del self._deadlines[deadline.id]
+            due.append(deadline)
+        self.expired.extend(due)
+        return due
+
+    def next_n(self, n, offset=0):
+        """
+        Returns up to n upcoming deadlines in due order, skipping the first
+        `offset` (for paging). The heap is walked best-first from the root
+        without being modified, so this costs O(k log k) for k = offset + n.
+        """
+        result = []
+        if not self._heap:
+            return result
+        heap = self._heap
+        frontier = [(heap[0], 0)]
+        while frontier and len(result) < n:
+            entry, index = heapq.heappop(frontier)
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+            deadline = self._live(entry)
+            if deadline is None:
+                continue
+            if offset:
+                offset -= 1
+            else:
+                result.append(deadline)
+        return result
+
+    def next_change(self, shown, now, resolution=1):
+        """
+        Seconds from timestamp `now` until a shown remaining value ticks over
+        at the given resolution, or the next deadline expires, whichever is
+        first. Returns None when there is nothing to wait for.
+        """
+        waits = []
+        for deadline in shown:
+            remaining = deadline.remaining(now)
+            if remaining > 0:
+                waits.append(remaining % resolution or resolution)
+        upcoming = self.peek()
+        if upcoming is not None:
+            waits.append(max(0.0, upcoming.remaining(now)))
+        return min(waits) if waits else None
+
+
+class Alarm:
+    """
+    A threshold before a deadline, e.g. T-1h, with an optional action that
+    is called with the alarm when it goes off.
+    """
+    __slots__ = ("id", "deadline", "offset", "action", "fire_at", "_seq")
+
+    def __init__(self, alarm_id, deadline, offset, action=None):
+        self.id = alarm_id
+        self.deadline = deadline
+        self.offset = offset
+        self.action = action
+        self.fire_at = deadline.timestamp - offset
+        self._seq = None
+
+    @property
+    def label(self):
+        return format_offset(self.offset)
+
+    def __repr__(self):
+        return f"Alarm({self.id}, {self.deadline.name!r}, {self.label})"
+
+
+class AlarmSchedule:
+    """
+    Keeps alarm thresholds for any number of deadlines in one min-heap
+    ordered by firing time, so a caller sleeps until next_due() and pops
+    what is due instead of checking every threshold on every tick.
+
+    Like CountdownEngine, rescheduling and removal leave stale heap entries
+    behind that are skipped when reached; adding, firing and moving an alarm
+    all cost O(log n) however many alarms are armed. Alarms whose time has
+    already passed when they are armed are kept but never fire.
+    """
+    def __init__(self):
+        self._heap = [] # (fire_at, seq, alarm id)
+        self._alarms = {}
+        self._by_deadline = {} # deadline id -> [alarm ids]
+        self._ids = itertools.count(1)
+        self._seqs = itertools.count()
+        self._stale = 0
+
+    def __len__(self):
+        return len(self._alarms)
+
+    def add(self, deadline, offset, action=None, now=None):
+        """
+        Arms an alarm `offset` seconds before `deadline` and returns it.
+        """
+        alarm = Alarm(next(self._ids), deadline, offset, action)
+        self._alarms[alarm.id] = alarm
+        self._by_deadline.setdefault(deadline.id, []).append(alarm.id)
+        self._arm(alarm, now)
+        return alarm
+
+    def alarms_for(self, deadline_id):
+        return [self._alarms[alarm_id] for alarm_id in self._by_deadline.get(deadline_id, ())]
+
+    def remove(self, alarm_id):
+        alarm = self._alarms.pop(alarm_id, None)
+        if alarm is not None:
+            ids = self._by_deadline[alarm.deadline.id]
+            ids.remove(alarm_id)
+            if not ids:
+                del self._by_deadline[alarm.deadline.id]
+            if alarm._seq is not None:
+                self._mark_stale()
+        return alarm
+
+    def remove_deadline(self, deadline_id):
+        """Drops every alarm of a deadline."""
+        for alarm_id in list(self._by_deadline.get(deadline_id, ())):
+            self.remove(alarm_id)
+
+    def reschedule_deadline(self, deadline, now=None):
+        """
+        Re-arms the alarms of a deadline after its due time changed, so
+        thresholds that already fired go off again for the new time.
+        """
+        stale = 0
+        for alarm in self.alarms_for(deadline.id):
+            stale += alarm._seq is not None # Its old heap entry is left behind
+            alarm.deadline = deadline
+            alarm.fire_at = deadline.timestamp - alarm.offset
+            self._arm(alarm, now)
+        # Counted once every alarm is re-armed, so a compaction sees them all in their new state
+        for _ in range(stale):
+            self._mark_stale()
+
+    def _arm(self, alarm, now):
+        if now is not None and alarm.fire_at < now:
+            alarm._seq = None
+            return
+        alarm._seq = next(self._seqs)
+        heapq.heappush(self._heap, (alarm.fire_at, alarm._seq, alarm.id))
+
+    def _live(self, entry):
+        alarm = self._alarms.get(entry[2])
+        return alarm if alarm is not None and alarm._seq == entry[1] else None
+
+    def _mark_stale(self):
+        self._stale += 1
+        if self._stale > 64 and self._stale > len(self._alarms):
+            self._heap = [(a.fire_at, a._seq, a.id) for a in self._alarms.values() if a._seq is not None]
+            heapq.heapify(self._heap)
+            self._stale = 0
+
+    def due(self, now):
+        """
+        Returns the alarms due at or before timestamp `now` in firing order.
+        Each alarm fires once until its deadline is rescheduled.
+        """
+        fired = []
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            alarm = self._live(entry)
+            if alarm is None:
+                self._stale -= 1
+                continue
+            alarm._seq = None
+            fired.append(alarm)
+        return fired
+
+    def next_due(self, now):
+        """
+        Seconds from timestamp `now` until the next alarm, or None when
+        nothing is armed.
+        """
+        while self._heap:
+            if self._live(self._heap[0]) is not None:
+                return max(0.0, self._heap[0][0] - now)
+            heapq.heappop(self._heap)
+            self._stale -= 1
+        return None
+
+
+def parse_deadline(text):
+    """
+    Splits "YYYY-MM-DD HH:MM:SS name" into (datetime, name), with name
+    None when it is left out. Raises ValueError for an invalid date.
+    """
+    text = text.strip()
+    return datetime.strptime(text[:19], DATE_FORMAT), text[19:].strip() or None
+
+
+def load_deadlines(path, engine=None):
+    """
+    Reads deadlines from a text file into an engine, one per line as
+    "YYYY-MM-DD HH:MM:SS name". Blank lines and lines starting with # are
+    ignored; malformed lines are reported and skipped.
+    """
+    engine = engine if engine is not None else CountdownEngine()
+    if not os.path.exists(path):
+        return engine
+    with open(path, 'r') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            try:
+                when, name = parse_deadline(line)
+            except ValueError:
+                print(f"Skipping invalid deadline on line {line_number} of {path}: {line}")
+                continue
+            engine.add(name or line[:19], when)
+    return engine
@@ -0,0 +1,256 @@
+"""
+Where the doom date is stored and how changes to it are saved and noticed.
+
+The date lives in a file at an absolute path (see default_path) so the
+counter does not depend on the directory it was started from. Saves write a
+temporary file and rename it over the old one, so a crash never leaves a
+truncated date behind. FileWatcher picks up edits made by other programs,
+such as config management, using inotify where available and polling
+otherwise, and parses the file on its own thread. Window positions are
+kept next to it.
+"""
+import json
+import os
+import select
+import struct
+import sys
+import tempfile
+import threading
+import time
+
+from recurrence import parse_doom_date
+
+LEGACY_PATH = "doom_date.txt" # Relative to the working directory, used by older versions
+
+
+def config_dir():
+    """The per-user config directory of the counter."""
+    if sys.platform == "win32":
+        base = os.environ.get("APPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+    return os.path.join(base, "doomcounter")
+
+
+def default_path():
+    """
+    $DOOMCOUNTER_DATE_FILE if set, else doom_date.txt in the per-user
+    config directory.
+    """
+    path = os.environ.get("DOOMCOUNTER_DATE_FILE")
+    if path:
+        return os.path.abspath(os.path.expanduser(path))
+    return os.path.join(config_dir(), "doom_date.txt")
+
+
+def window_state_path():
+    """Where window positions are remembered between runs."""
+    return os.path.join(config_dir(), "windows.json")
+
+
+def read_window_state(path):
+    """
+    Window geometries saved by save_window_state, as {key: (x, y, width,
+    height)}; empty when the file is missing or damaged.
+    """
+    try:
+        with open(path, 'r') as f:
+            state = json.load(f)
+        return {key: tuple(int(n) for n in value) for key, value in state.items() if len(value) == 4}
+    except (OSError, ValueError, TypeError, AttributeError):
+        return {}
+
+
+def save_window_state(path, state):
+    atomic_write(path, json.dumps({key: list(value) for key, value in state.items()}))
+
+
+def read_doom_entry(path):
+    """
+    Reads the doom date stored in `path`: a date, a zoned date or a
+    recurrence rule (see recurrence.py). Returns (doom date, Schedule or
+    None), or (None, None) when the file is missing or invalid.
+    """
+    try:
+        with open(path, 'r') as f:
+            return parse_doom_date(f.read())
+    except (OSError, ValueError):
+        return None, None
+
+
+def load_doom_entry(path):
+    """
+    Like read_doom_entry, falling back to a doom_date.txt in the working
+    directory left by older versions.
+    """
+    entry = read_doom_entry(path)
+    if entry[0] is None and not os.path.exists(path):
+        entry = read_doom_entry(LEGACY_PATH)
+    return entry
+
+
+def load_doom_date(path):
+    """
+    The next doom date stored in `path` (see load_doom_entry), or None if
+    there is no valid one.
+    """
+    return load_doom_entry(path)[0]
+
+
+def atomic_write(path, text):
+    """
+    Replaces the contents of `path` with `text` so readers see either the
+    old or the new contents, never a partial write.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    if hasattr(os, "O_DIRECTORY"):
+        # Make the rename itself durable
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+# inotify(7) event bits
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+_EVENT = struct.Struct("iIII")
+
+
+def _inotify_watch(directory):
+    """
+    Returns an inotify fd watching `directory`, or None where inotify is not
+    available.
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+    import ctypes
+    import ctypes.util
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+class FileWatcher:
+    """
+    Watches one file and calls `callback(doom_date, schedule)` on the
+    watcher thread after it changes, with the freshly parsed entry (both
+    None if the file is missing or invalid).
+
+    The directory is watched rather than the file, so atomic renames are
+    seen. Bursts of events are coalesced: the file is parsed once, `debounce`
+    seconds after the first event of a burst. Without inotify the file's
+    stat signature is compared every `poll_interval` seconds instead.
+    """
+    def __init__(self, path, callback, debounce=0.5, poll_interval=2.0):
+        self.path = os.path.abspath(path)
+        self.callback = callback
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.parses = 0
+        self.mode = None # "inotify" or "poll" once started
+        self._thread = None
+        self._stop = threading.Event()
+        self._stop_r = self._stop_w = None # Wakes the inotify select on stop
+
+    def start(self):
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        fd = _inotify_watch(directory)
+        if fd is not None:
+            self.mode = "inotify"
+            self._stop_r, self._stop_w = os.pipe()
+            target = lambda: self._run_inotify(fd)
+        else:
+            self.mode = "poll"
+            target = self._run_poll
+        self._thread = threading.Thread(target=target, name="doomcounter-datefile", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        if self._stop_w is not None:
+            os.write(self._stop_w, b"x")
+        self._thread.join(timeout=1.0)
+        self._thread = None
+        if self._stop_r is not None:
+            os.close(self._stop_r)
+            os.close(self._stop_w)
+            self._stop_r = self._stop_w = None
+
+    def _changed(self):
+        self.parses += 1
+        self.callback(*read_doom_entry(self.path))
+
+    def _run_inotify(self, fd):
+        name = os.fsencode(os.path.basename(self.path))
+        due = None # Monotonic time the pending change gets parsed
+        try:
+            while True:
+                timeout = None if due is None else max(0.0, due - time.monotonic())
+                ready, _, _ = select.select([fd, self._stop_r], [], [], timeout)
+                if self._stop_r in ready:
+                    return
+                if fd in ready:
+                    try:
+                        data = os.read(fd, 65536)
+                    except BlockingIOError:
+                        data = b""
+                    offset = 0
+                    while offset < len(data):
+                        _, mask, _, length = _EVENT.unpack_from(data, offset)
+                        offset += _EVENT.size
+                        event_name = data[offset:offset + length].rstrip(b"\0")
+                        offset += length
+                        if event_name == name and due is None:
+                            due = time.monotonic() + self.debounce
+                if due is not None and time.monotonic() >= due:
+                    due = None
+                    self._changed()
+        finally:
+            os.close(fd)
+
+    def _signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def _run_poll(self):
+        last = self._signature()
+        while not self._stop.wait(self.poll_interval):
+            signature = self._signature()
+            if signature != last:
+                last = signature
+                self._changed()
@@ -0,0 +1,240 @@
+"""
+Append-only log of what happened to the doom dates: when a deadline was
+moved, reached or rolled over to its next occurrence, and when extra
+countdown windows came and went.
+
+Events go to an SQLite database in WAL mode. log() only puts the event on
+a queue; a writer thread commits whatever has queued up in one
+transaction at most every flush_interval seconds, so the Tk thread never
+waits for the disk. Queries open their own read connection, which WAL
+lets run alongside the writer, and use indexes on (at), (deadline, at)
+and (kind, at) so they stay fast with years of history.
+
+    python history.py            recent events
+    python history.py --past     deadlines that have been reached
+    python history.py --slips    how often and how far each deadline slipped
+"""
+import argparse
+import os
+import queue
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+
+from countdown import DATE_FORMAT, format_offset
+from datefile import config_dir
+
+SCHEMA_VERSION = 2 # Bumping it re-runs SCHEMA, which only adds what is missing
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    at REAL NOT NULL,
+    kind TEXT NOT NULL,
+    deadline TEXT NOT NULL,
+    due REAL,
+    previous REAL,
+    detail TEXT
+);
+CREATE INDEX IF NOT EXISTS events_at ON events (at);
+CREATE INDEX IF NOT EXISTS events_deadline_at ON events (deadline, at);
+CREATE INDEX IF NOT EXISTS events_kind_at ON events (kind, at);
+"""
+INSERT = "INSERT INTO events (at, kind, deadline, due, previous, detail) VALUES (?, ?, ?, ?, ?, ?)"
+
+# at, due and previous are timestamps; previous is the due time before a change
+Event = namedtuple("Event", ["at", "kind", "deadline", "due", "previous", "detail"])
+Slip = namedtuple("Slip", ["deadline", "slips", "seconds", "first", "last"])
+
+_STOP = object()
+
+
+def history_path():
+    """Where the event log is kept by default."""
+    return os.path.join(config_dir(), "history.sqlite3")
+
+
+class EventLog:
+    """
+    Writes events from any thread through a background writer, started by
+    the first log(), and answers queries about them. Without the sqlite3
+    module events are dropped.
+    """
+    def __init__(self, path, flush_interval=1.0, batch_size=500):
+        self.path = os.path.abspath(path)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.written = 0
+        self.commits = 0
+        self.error = None
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def log(self, kind, deadline, due=None, previous=None, detail=None, at=None):
+        """Queues an event; never blocks on the database."""
+        if self._thread is None:
+            self._start()
+        self._queue.put(Event(time.time() if at is None else at, kind, deadline, due, previous, detail))
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="doomcounter-history", daemon=True)
+                self._thread.start()
+
+    def flush(self, timeout=5.0):
+        """Waits until everything logged so far is committed."""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=2.0):
+        """Commits what is queued and ends the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join(timeout)
+
+    def _connect(self):
+        import sqlite3
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode NORMAL syncs at checkpoints rather than on every commit
+        connection.execute("PRAGMA synchronous=NORMAL")
+        if connection.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            connection.executescript(SCHEMA)
+            connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        return connection
+
+    def _run(self):
+        # Imported and opened here so the Tk thread never waits for it during startup
+        try:
+            connection = self._connect()
+        except Exception as e:
+            self.error = e
+            print(f"Event log unavailable: {e}")
+            connection = None
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            # Collect whatever else arrives in the next flush_interval into the same commit
+            flush_at = time.monotonic() + self.flush_interval
+            while batch[-1] is not _STOP and not isinstance(batch[-1], threading.Event) \
+                    and len(batch) < self.batch_size:
+                timeout = flush_at - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            rows = [item for item in batch if isinstance(item, Event)]
+            if rows and connection is not None:
+                try:
+                    with connection:
+                        connection.executemany(INSERT, rows)
+                    self.written += len(rows)
+                    self.commits += 1
+                except Exception as e:
+                    self.error = e
+                    print(f"Error writing the event log: {e}")
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+                elif item is _STOP:
+                    running = False
+        if connection is not None:
+            connection.close()
+
+    def _query(self, sql, parameters=()):
+        import sqlite3
+        try:
+            connection = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        except sqlite3.OperationalError:
+            return [] # Nothing logged yet
+        try:
+            return connection.execute(sql, parameters).fetchall()
+        except sqlite3.OperationalError:
+            return []
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _where(deadline=None, kind=None, since=None, until=None):
+        clauses, parameters = [], []
+        for column, operator, value in (("deadline", "=", deadline), ("kind", "=", kind),
+                                        ("at", ">=", since), ("at", "<", until)):
+            if value is not None:
+                clauses.append(f"{column} {operator} ?")
+                parameters.append(value)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), parameters
+
+    def events(self, deadline=None, kind=None, since=None, until=None, limit=100):
+        """
+        Logged events, newest first, optionally only of one deadline or
+        kind and between the timestamps `since` and `until`.
+        """
+        where, parameters = self._where(deadline, kind, since, until)
+        rows = self._query("SELECT at, kind, deadline, due, previous, detail FROM events"
+                           f"{where} ORDER BY at DESC LIMIT ?", (*parameters, limit))
+        return [Event(*row) for row in rows]
+
+    def past_deadlines(self, deadline=None, since=None, limit=50):
+        """Deadlines that were reached, most recent first."""
+        return self.events(deadline, "reached", since, limit=limit)
+
+    def slips(self, deadline=None, since=None):
+        """
+        How often each deadline was moved later, by how many seconds in
+        total, and when it first and last slipped; most slipped first.
+        """
+        where, parameters = self._where(deadline, "changed", since)
+        rows = self._query("SELECT deadline, COUNT(*), SUM(due - previous), MIN(at), MAX(at) FROM events"
+                           f"{where} AND due > previous GROUP BY deadline ORDER BY COUNT(*) DESC",
+                           parameters)
+        return [Slip(*row) for row in rows]
+
+
+def _format_time(ts):
+    return datetime.fromtimestamp(ts).strftime(DATE_FORMAT) if ts is not None else "-"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Show the Doom Counter's event log")
+    parser.add_argument("--file", metavar="PATH", help="event log to read (default: in the user config directory)")
+    parser.add_argument("--deadline", metavar="KEY", help="only this countdown, e.g. main or window:Launch")
+    parser.add_argument("--past", action="store_true", help="list deadlines that have been reached")
+    parser.add_argument("--slips", action="store_true", help="count how often each deadline was pushed back")
+    parser.add_argument("--days", type=float, metavar="N", help="only the last N days")
+    parser.add_argument("--limit", type=int, default=50, metavar="N", help="events to list")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    log = EventLog(args.file or history_path())
+    since = time.time() - args.days * 86400 if args.days else None
+    try:
+        if args.slips:
+            for slip in log.slips(args.deadline, since):
+                print(f"{slip.deadline:<24}{slip.slips:>5} slips  {format_offset(int(slip.seconds)).replace('T-', '', 1):>12} total"
+                      f"  last {_format_time(slip.last)}")
+        elif args.past:
+            for event in log.past_deadlines(args.deadline, since, args.limit):
+                print(f"{_format_time(event.due)}  {event.deadline}")
+        else:
+            for event in log.events(args.deadline, since=since, limit=args.limit):
+                change = f"{_format_time(event.previous)} -> " if event.previous is not None else ""
+                print(f"{_format_time(event.at)}  {event.kind:<12}{event.deadline:<24}"
+                      f"{change}{_format_time(event.due)}  {event.detail or ''}".rstrip())
+    finally:
+        log.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Single-instance control socket for the Doom Counter.
+
+The running counter listens on a Unix domain socket with an asyncio server
+on a background thread; later launches and scripts send it one-line text
+commands ("set-date 2025-12-31 23:59:59", "open 2026-03-01 09:00:00 Launch",
+"remaining", "show", ...) and get one line back, starting with "ok" or
+"error". The client side uses a plain blocking socket so forwarding a
+command never pays for importing asyncio or starting Tk.
+"""
+import os
+import socket
+import tempfile
+import threading
+
+COMMANDS = ("set-date", "open", "remaining", "date", "show", "hide", "compact", "quit", "ping")
+
+
+def default_socket_path():
+    """
+    Per-user socket path: in $XDG_RUNTIME_DIR when set, else the temp dir.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "doomcounter.sock")
+    uid = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+    return os.path.join(tempfile.gettempdir(), f"doomcounter-{uid}.sock")
+
+
+def send_command(path, command, timeout=2.0):
+    """
+    Sends one command to a running instance and returns its reply line.
+    Raises OSError (e.g. FileNotFoundError, ConnectionRefusedError) when no
+    instance is listening.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(command.encode() + b"\n")
+        reply = b""
+        while not reply.endswith(b"\n"):
+            chunk = sock.recv(4096)
+            if not chunk:
+                break
+            reply += chunk
+    return reply.decode().strip()
+
+
+def instance_running(path):
+    try:
+        return send_command(path, "ping", timeout=0.5) == "ok pong"
+    except OSError:
+        return False
+
+
+class ControlServer:
+    """
+    Serves commands on a Unix domain socket from an asyncio loop running on
+    a daemon thread.
+
+    `handler(command, argument)` is called on that thread and returns the
+    reply text, or a concurrent.futures.Future of it for work that has to
+    run elsewhere (e.g. on the Tk thread); the connection waits for the
+    future without blocking other clients.
+    """
+    def __init__(self, path, handler):
+        self.path = path
+        self.handler = handler
+        self.commands = 0
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+        self.error = None
+
+    def start(self):
+        """Starts listening; returns False if the socket could not be bound."""
+        self._thread = threading.Thread(target=self._run, name="doomcounter-ipc", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self.error is None
+
+    def stop(self):
+        """Closes the socket and open connections and ends the thread."""
+        if self._server is None:
+            return
+        import asyncio
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop)
+        self._thread.join(timeout=1.0)
+        self._server = None
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+    async def _shutdown(self):
+        import asyncio
+        self._server.close()
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop.stop()
+
+    def _run(self):
+        # Imported here so the Tk thread never waits for it during startup
+        import asyncio
+        loop = self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            if os.path.exists(self.path):
+                if instance_running(self.path):
+                    raise FileExistsError(f"another instance is listening on {self.path}")
+                os.unlink(self.path) # Left behind by a crashed instance
+            self._server = loop.run_until_complete(asyncio.start_unix_server(self._serve, path=self.path))
+            os.chmod(self.path, 0o600)
+        except OSError as e:
+            self.error = e
+            self._ready.set()
+            loop.close()
+            return
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    async def _serve(self, reader, writer):
+        import asyncio
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command, _, argument = line.decode(errors="replace").strip().partition(" ")
+                self.commands += 1
+                if command not in COMMANDS:
+                    reply = f"error unknown command {command!r}"
+                else:
+                    try:
+                        reply = self.handler(command, argument.strip())
+                        if not isinstance(reply, str):
+                            reply = await asyncio.wrap_future(reply)
+                    except Exception as e:
+                        reply = f"error {e}"
+                writer.write(reply.encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
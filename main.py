@@ -1,25 +1,267 @@
-import customtkinter as ctk
+import time
+_T_START = time.perf_counter()
 from datetime import datetime, timedelta
 import os
+import sys
+import argparse
+import re
+import tkinter as tk
 from tkinter import messagebox
+import itertools
 import math
-import pystray  # For system tray icon
-from PIL import Image, ImageDraw, ImageFont
+import queue
+import socket
 import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future
+_T_STDLIB = time.perf_counter()
+import customtkinter as ctk
+from PIL import ImageTk # Loaded by customtkinter anyway
+_T_CTK = time.perf_counter()
+from countdown import (AlarmSchedule, DATE_FORMAT, Deadline, countdown_values, format_remaining,
+                       load_deadlines, parse_deadline, parse_offset, remaining_seconds)
+from datefile import (LEGACY_PATH, FileWatcher, atomic_write, default_path, load_doom_date, load_doom_entry,
+                      read_window_state, save_window_state, window_state_path)
+from history import EventLog, history_path
+from ipc import ControlServer, default_socket_path, send_command
+from metrics import COUNT_BUCKETS, METRICS
+from recurrence import ROLLOVER_SECONDS, parse_doom_date
+from render import THEME, load_pil_font, render_card_half
+_T_LOCAL = time.perf_counter()
+
+
+class StartupProfile:
+    """
+    Collects named startup phases for --profile-startup, starting with the
+    module-level imports timed above.
+    """
+    def __init__(self):
+        self.phases = [
+            ("import stdlib", _T_STDLIB - _T_START),
+            ("import customtkinter", _T_CTK - _T_STDLIB),
+            ("import local modules", _T_LOCAL - _T_CTK),
+        ]
+        self._last = _T_LOCAL
+    
+    def mark(self, name):
+        """Ends the current phase under `name`."""
+        now = time.perf_counter()
+        self.phases.append((name, now - self._last))
+        self._last = now
+    
+    def report(self):
+        lines = ["Startup profile (ms):"]
+        for name, seconds in self.phases:
+            lines.append(f"  {name:<24}{seconds * 1000:8.1f}")
+        lines.append(f"  {'time to first frame':<24}{(self._last - _T_START) * 1000:8.1f}")
+        return "\n".join(lines)
+
+
+# Static halves plus one pre-rendered image per animation step
+FlipSprites = namedtuple("FlipSprites", ["top", "bottom", "frames"])
+
+
+class FlipSpriteCache:
+    """
+    LRU-bounded cache of pre-rendered flip frames.
+    Entries are keyed by value, size, font and colours, so each distinct
+    card face is rendered once and afterwards only swapped on a canvas.
+    """
+    def __init__(self, maxsize=80):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, master, value, width, height, font, frame_heights,
+            top_color="#2b2b2b", bottom_color="#333333", text_color="#ff4d4d", corner_radius=5):
+        """
+        Returns the FlipSprites for a value, rendering and caching them on a miss.
+        """
+        key = (value, width, height, font, tuple(frame_heights), top_color, bottom_color, text_color, corner_radius)
+        sprites = self._entries.get(key)
+        if sprites is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return sprites
+
+        self.misses += 1
+        family, size = font[0], font[1]
+        pil_font = load_pil_font(family, size, "bold" in font[2:])
+        half = height // 2
+
+        def photo(h, fg_color):
+            image = render_card_half(value, width, h, pil_font, fg_color, text_color, corner_radius)
+            return ImageTk.PhotoImage(image, master=master)
 
-class FlippingLabel(ctk.CTkFrame):
+        top = photo(half, top_color)
+        bottom = photo(half, bottom_color)
+        # Frames of the same height are identical, so render each height once
+        by_height = {}
+        frames = []
+        for h in frame_heights:
+            if h not in by_height:
+                by_height[h] = top if h == half else photo(h, top_color)
+            frames.append(by_height[h])
+
+        sprites = FlipSprites(top, bottom, frames)
+        self._entries[key] = sprites
+        if len(self._entries) > self.maxsize:
+            # Labels keep references to the sprites they display, so evicting is safe
+            self._entries.popitem(last=False)
+        return sprites
+
+    def clear(self):
+        self._entries.clear()
+
+
+class FlipCard:
+    """
+    The flip state shared by FlippingLabel and CanvasCard: the value shown,
+    the value flipping in, and at most one value queued behind it.
+
+    Renderers only draw: _draw_begin() sets up the first frame of a flip,
+    _draw_frame(angle) draws one step, _draw_end() settles on the new value
+    and _draw_value(value) shows a value without animating. _start_frames()
+    and _stop_frames() attach the card to, or detach it from, whatever
+    drives its frames.
+    """
+    animation_speed = 15 # Degrees per frame of the flip (0 to 180)
+
+    def init_flip(self):
+        self.current_value = "0"
+        self.next_value = "0"
+        self.animation_step = 0 # Angle of the flip
+        self.is_animating = False
+        self._pending_value = None
+        # Widget updates made by this card, read per tick by DoomCounter
+        self.configure_calls = 0
+
+    def set_value(self, new_value):
+        """
+        Sets the new value for the card and starts the flip animation if different.
+        A value that arrives mid-flip is queued and flipped to when the current flip ends.
+        An unchanged value costs no widget updates at all.
+        """
+        if self.is_animating:
+            self._pending_value = None if new_value == self.next_value else new_value
+        elif new_value != self.current_value:
+            self.next_value = new_value
+            self._begin_flip()
+            self._start_frames()
+
+    def _begin_flip(self):
+        self.is_animating = True
+        self.animation_step = 0
+        self._draw_begin()
+
+    def advance(self, frames=1):
+        """
+        Draws the next animation frame, skipping frames - 1 intermediate ones.
+        Returns True while the flip is still running.
+        """
+        if frames > 1:
+            self.animation_step += self.animation_speed * (frames - 1)
+
+        if self.animation_step <= 180: # Flip from 0 to 180 degrees
+            angle = self.animation_step
+            self.animation_step += self.animation_speed
+            self._draw_frame(angle)
+            return True
+
+        # Animation complete
+        self.current_value = self.next_value
+        if self._pending_value is not None and self._pending_value != self.current_value:
+            # A newer value arrived mid-flip, flip straight on to it
+            self.next_value = self._pending_value
+            self._pending_value = None
+            self._begin_flip()
+            return self.advance()
+        self._pending_value = None
+        self._draw_end()
+        self.is_animating = False
+        return False
+
+    def snap_to(self, value):
+        """
+        Shows a value immediately without animating, cancelling any flip in progress.
+        """
+        self._pending_value = None
+        if value == self.current_value and not self.is_animating:
+            return
+        self._stop_frames()
+        self.is_animating = False
+        self.current_value = self.next_value = value
+        self._draw_value(value)
+
+class FlippingLabel(FlipCard, ctk.CTkFrame):
     """
     A custom widget that displays a flipping animation for a single digit.
     It simulates a card flipping from one digit to the next.
+
+    render_mode "widgets" animates three CTkLabels; "sprites" draws pre-rendered
+    frames from a FlipSpriteCache on a single canvas and only swaps images.
     """
-    def __init__(self, master, width=60, height=80, font=('Consolas', 42, 'bold'), **kwargs):
+    def __init__(self, master, width=60, height=80, font=('Consolas', 42, 'bold'),
+                 render_mode="widgets", sprite_cache=None, animation_driver=None, **kwargs):
         super().__init__(master, fg_color="transparent", width=width, height=height, **kwargs)
         
         self.width = width
         self.height = height
         self.font = font
-        self.current_value = "0"
-        self.next_value = "0"
+        self.render_mode = render_mode
+        self.animation_driver = animation_driver
+        self.init_flip()
+        self._animation_job = None
+        
+        if render_mode == "sprites":
+            self._build_sprite_canvas(sprite_cache)
+        else:
+            self._build_widgets()
+    
+    def _build_sprite_canvas(self, sprite_cache):
+        """
+        Creates the single canvas used by the sprite render mode.
+        """
+        self.sprite_cache = sprite_cache if sprite_cache is not None else FlipSpriteCache()
+        self._px_width = round(self._apply_widget_scaling(self.width))
+        self._px_height = round(self._apply_widget_scaling(self.height))
+        self._px_font = (self.font[0], round(self._apply_widget_scaling(self.font[1])), *self.font[2:])
+        half = self._px_height // 2
+        self._frame_heights = [
+            max(1, int(half * abs(math.cos(math.radians(angle)))))
+            for angle in range(0, 181, self.animation_speed)
+        ]
+        
+        self.canvas = tk.Canvas(
+            self,
+            width=self._px_width,
+            height=self._px_height,
+            bg=self._apply_appearance_mode(self._bg_color),
+            highlightthickness=0,
+            bd=0
+        )
+        self.canvas.place(x=0, y=0)
+        
+        sprites = self._sprites(self.current_value)
+        self._shown = {"top": sprites, "bottom": sprites}
+        self.top_item = self.canvas.create_image(0, 0, image=sprites.top, anchor='nw')
+        self.bottom_item = self.canvas.create_image(0, half, image=sprites.bottom, anchor='nw')
+        self.flip_item = self.canvas.create_image(0, 0, image=sprites.top, anchor='nw', state='hidden')
+    
+    def _sprites(self, value):
+        return self.sprite_cache.get(self.canvas, value, self._px_width, self._px_height,
+                                     self._px_font, self._frame_heights)
+    
+    def _build_widgets(self):
+        """
+        Creates the three CTkLabels used by the widgets render mode.
+        """
+        width = self.width
+        height = self.height
         
         # The static top half of the current card
         self.top_half = ctk.CTkLabel(
@@ -63,109 +305,1062 @@ class FlippingLabel(ctk.CTkFrame):
         self.top_flipping_card.place(x=0, y=0)
         self.top_flipping_card.lower() # Place it behind top_half initially
         
-        # Animation variables
-        self.animation_step = 0 # Angle for the flip (0 to 180)
-        self.animation_speed = 15 # Speed of the animation
-        self.is_animating = False
+    def _configure(self, widget, **kwargs):
+        # Every widget update goes through here so it can be counted
+        self.configure_calls += 1
+        widget.configure(**kwargs)
+    
+    def _configure_item(self, item, **kwargs):
+        self.configure_calls += 1
+        self.canvas.itemconfigure(item, **kwargs)
+    
+    def _move_item(self, item, x, y):
+        self.configure_calls += 1
+        self.canvas.coords(item, x, y)
+    
+    def _start_frames(self):
+        if self.animation_driver is not None:
+            # Draw the first frame now, the shared driver takes over from here
+            self.advance()
+            self.animation_driver.add(self)
+        else:
+            self.animate()
+    
+    def _stop_frames(self):
+        if self._animation_job is not None:
+            self.after_cancel(self._animation_job)
+            self._animation_job = None
+        if self.animation_driver is not None:
+            self.animation_driver.remove(self)
+    
+    def animate(self):
+        """
+        Performs the frame-by-frame animation of the flipping card.
+        Only used when no AnimationDriver is attached; the label then schedules itself.
+        """
+        start = time.perf_counter()
+        running = self.advance()
+        METRICS.observe("animation_frame_seconds", time.perf_counter() - start)
+        if running:
+            self._animation_job = self.after(20, self.animate) # Continue animation
+        else:
+            self._animation_job = None
+    
+    def _draw_begin(self):
+        """
+        Puts the current and next value in place for the first animation frame.
+        """
+        if self.render_mode == "sprites":
+            current = self._sprites(self.current_value)
+            nxt = self._sprites(self.next_value)
+            # Hold references so LRU eviction cannot drop images still on screen
+            self._shown = {"top": current, "bottom": nxt}
+            self._configure_item(self.top_item, image=current.top)
+            self._configure_item(self.bottom_item, image=nxt.bottom)
+            self._configure_item(self.flip_item, image=current.frames[0], state='normal')
+            self._move_item(self.flip_item, 0, 0)
+        else:
+            # Set the static top half to the current value
+            self._configure(self.top_half, text=self.current_value)
+            # Set the static bottom half to the next value (will be revealed)
+            self._configure(self.bottom_half, text=self.next_value)
+            
+            # The flipping card starts showing the current value's top half
+            self._configure(self.top_flipping_card, text=self.current_value)
+            self._flip_text = self.current_value
+            self.top_flipping_card.place(x=0, y=0)
+            self.top_flipping_card.lift() # Bring to front for animation
+    
+    def _draw_frame(self, angle):
+        if self.render_mode == "sprites":
+            self._draw_sprite_frame(angle)
+        else:
+            self._draw_widget_frame(angle)
+    
+    def _draw_widget_frame(self, angle):
+        # Calculate perspective scale for the flipping card
+        # Scale goes from 1 down to 0 and back to 1
+        scale = math.cos(math.radians(angle))
+        height = max(1, int((self.height / 2) * abs(scale)))
         
-    def set_value(self, new_value):
+        if angle <= 90:
+            # First half of the flip: top card flips down, revealing its back (which is the bottom_half of the next value)
+            self._configure(self.top_flipping_card, height=height)
+            self.top_flipping_card.place_configure(y=0)
+        else:
+            # Second half of the flip: top card continues flipping, now showing the next value's top half
+            # It appears to come up from the bottom, but it's actually just the top_flipping_card changing its text
+            if self._flip_text != self.next_value:
+                self._flip_text = self.next_value
+                self._configure(self.top_flipping_card, text=self.next_value, height=height)
+            else:
+                self._configure(self.top_flipping_card, height=height)
+            self.top_flipping_card.place_configure(y=self.height - height) # Adjust y to simulate flipping up
+    
+    def _draw_sprite_frame(self, angle):
+        # Sprite-mode counterpart of _draw_widget_frame: one image swap and one move
+        index = angle // self.animation_speed
+        height = self._frame_heights[index]
+        if angle <= 90:
+            # Current value's top half folding down
+            frame = self._shown["top"].frames[index]
+            y = 0
+        else:
+            # Next value's top half coming up from the bottom
+            frame = self._shown["bottom"].frames[index]
+            y = self._px_height - height
+        self._configure_item(self.flip_item, image=frame)
+        self._move_item(self.flip_item, 0, y)
+    
+    def _draw_end(self):
+        if self.render_mode == "sprites":
+            sprites = self._shown["bottom"]
+            self._shown = {"top": sprites, "bottom": sprites}
+            self._configure_item(self.top_item, image=sprites.top)
+            self._configure_item(self.flip_item, state='hidden')
+        else:
+            self._configure(self.top_half, text=self.current_value)
+            self.top_flipping_card.lower() # Hide the flipping card
+    
+    def _draw_value(self, value):
+        if self.render_mode == "sprites":
+            sprites = self._sprites(value)
+            self._shown = {"top": sprites, "bottom": sprites}
+            self._configure_item(self.top_item, image=sprites.top)
+            self._configure_item(self.bottom_item, image=sprites.bottom)
+            self._configure_item(self.flip_item, state='hidden')
+        else:
+            self._configure(self.top_half, text=value)
+            self._configure(self.bottom_half, text=value)
+            self._configure(self.top_flipping_card, text=value)
+            self.top_flipping_card.lower()
+
+class AnimationDriver:
+    """
+    Advances every active FlippingLabel from a single batched after() callback
+    per frame instead of one timer chain per card.
+    
+    The driver has nothing scheduled while no card is animating. When a frame
+    overruns its budget, the next frame skips the steps that should already
+    have been shown so flips still finish on time.
+    """
+    def __init__(self, widget, frame_ms=20):
+        self.widget = widget
+        self.frame_ms = frame_ms
+        self.active = []
+        
+        self.frames = 0
+        self.dropped = 0
+        
+        self._job = None
+        self._last_frame = None
+    
+    def add(self, label):
+        if label not in self.active:
+            self.active.append(label)
+        if self._job is None:
+            self._last_frame = time.monotonic()
+            self._job = self.widget.after(self.frame_ms, self._frame)
+    
+    def remove(self, label):
+        if label in self.active:
+            self.active.remove(label)
+        if not self.active:
+            self.stop()
+    
+    def stop(self):
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+        self.active = []
+    
+    def _frame(self):
+        start = time.monotonic()
+        budget = self.frame_ms / 1000
+        # Frames that elapsed since the previous one; more than one means we overran
+        elapsed = max(1, round((start - self._last_frame) / budget))
+        self._last_frame = start
+        self.frames += 1
+        self.dropped += elapsed - 1
+        if elapsed > 1:
+            METRICS.inc("animation_dropped_frames_total", elapsed - 1)
+        
+        self.active = [label for label in self.active if label.advance(elapsed)]
+        
+        spent = time.monotonic() - start
+        METRICS.observe("animation_frame_seconds", spent)
+        if self.active:
+            spent_ms = int(spent * 1000)
+            self._job = self.widget.after(max(1, self.frame_ms - spent_ms), self._frame)
+        else:
+            self._job = None
+
+class DigitGroup(ctk.CTkFrame):
+    """
+    A row of single-digit FlippingLabels with its unit caption underneath.
+    Only the digits that change flip, and the number of cards follows the
+    length of the value so days past 99 get extra cards.
+    """
+    def __init__(self, master, unit, min_digits=2, digit_width=40, height=100,
+                 text_color="#ffffff", **card_kwargs):
+        super().__init__(master, fg_color="transparent")
+        
+        self.min_digits = min_digits
+        self.digit_width = digit_width
+        self.digit_height = height
+        self.card_kwargs = card_kwargs
+        self.cards = []
+        # Configure calls of cards that were removed, so the total never goes backwards
+        self._retired_configure_calls = 0
+        
+        self.cards_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.cards_frame.pack()
+        
+        self.unit_label = ctk.CTkLabel(
+            self,
+            text=unit,
+            font=('Arial', 10, 'bold'),
+            text_color=text_color
+        )
+        self.unit_label.pack(pady=(5, 0))
+        
+        self._resize(min_digits)
+    
+    @property
+    def configure_calls(self):
+        return self._retired_configure_calls + sum(card.configure_calls for card in self.cards)
+    
+    def _resize(self, digits):
         """
-        Sets the new value for the label and initiates the flip animation if different.
+        Adds or removes leading digit cards until there are exactly `digits`.
         """
-        if new_value != self.current_value and not self.is_animating:
-            self.next_value = new_value
-            self.animate_flip()
-        elif new_value == self.current_value and not self.is_animating:
-            # If value is the same and not animating, ensure display is correct
-            self.top_half.configure(text=self.current_value)
-            self.bottom_half.configure(text=self.current_value)
-            self.top_flipping_card.configure(text=self.current_value)
-            self.top_flipping_card.lower() # Ensure it's hidden
+        while len(self.cards) < digits:
+            card = FlippingLabel(self.cards_frame, width=self.digit_width, height=self.digit_height,
+                                 **self.card_kwargs)
+            if self.cards:
+                card.pack(side='left', padx=1, before=self.cards[0])
+            else:
+                card.pack(side='left', padx=1)
+            self.cards.insert(0, card)
+        while len(self.cards) > digits:
+            card = self.cards.pop(0)
+            card.snap_to(card.current_value) # Detaches it from the animation driver
+            self._retired_configure_calls += card.configure_calls
+            card.destroy()
     
-    def animate_flip(self):
+    def set_value(self, value, animate=True):
         """
-        Prepares the labels for the flipping animation.
+        Shows a number string, one digit per card.
         """
-        self.is_animating = True
-        self.animation_step = 0
+        value = value.zfill(self.min_digits)
+        if len(value) != len(self.cards):
+            self._resize(len(value))
+        for card, digit in zip(self.cards, value):
+            if animate:
+                card.set_value(digit)
+            else:
+                card.snap_to(digit)
+
+class CanvasCard(FlipCard):
+    """
+    A flip card drawn as three image items on a shared canvas.
+    Draws like a sprite-mode FlippingLabel, but owns no widget of its own;
+    CanvasCountdown positions it and the AnimationDriver advances it.
+    """
+    def __init__(self, canvas, sprite_cache, animation_driver, width, height, font, frame_heights):
+        self.canvas = canvas
+        self.sprite_cache = sprite_cache
+        self.animation_driver = animation_driver
+        self.width = width
+        self.height = height
+        self.font = font
+        self.frame_heights = frame_heights
+        self.x = 0
+        self.y = 0
+        self.init_flip()
         
-        # Set the static top half to the current value
-        self.top_half.configure(text=self.current_value)
-        # Set the static bottom half to the next value (will be revealed)
-        self.bottom_half.configure(text=self.next_value)
+        sprites = self._sprites(self.current_value)
+        self._shown = {"top": sprites, "bottom": sprites}
+        self.top_item = canvas.create_image(0, 0, image=sprites.top, anchor='nw')
+        self.bottom_item = canvas.create_image(0, height // 2, image=sprites.bottom, anchor='nw')
+        self.flip_item = canvas.create_image(0, 0, image=sprites.top, anchor='nw', state='hidden')
+    
+    def _sprites(self, value):
+        return self.sprite_cache.get(self.canvas, value, self.width, self.height, self.font, self.frame_heights)
+    
+    def _configure_item(self, item, **kwargs):
+        self.configure_calls += 1
+        self.canvas.itemconfigure(item, **kwargs)
+    
+    def _move_item(self, item, x, y):
+        self.configure_calls += 1
+        self.canvas.coords(item, x, y)
+    
+    def move_to(self, x, y):
+        """Moves the card's top-left corner; the flip item follows on its next frame."""
+        if (x, y) == (self.x, self.y):
+            return
+        self.x = x
+        self.y = y
+        self._move_item(self.top_item, x, y)
+        self._move_item(self.bottom_item, x, y + self.height // 2)
+        self._move_item(self.flip_item, x, y)
+    
+    def _start_frames(self):
+        self.advance()
+        self.animation_driver.add(self)
+    
+    def _stop_frames(self):
+        self.animation_driver.remove(self)
+    
+    def _draw_begin(self):
+        current = self._sprites(self.current_value)
+        nxt = self._sprites(self.next_value)
+        self._shown = {"top": current, "bottom": nxt}
+        self._configure_item(self.top_item, image=current.top)
+        self._configure_item(self.bottom_item, image=nxt.bottom)
+        self._configure_item(self.flip_item, image=current.frames[0], state='normal')
+    
+    def _draw_frame(self, angle):
+        index = angle // self.animation_speed
+        height = self.frame_heights[index]
+        if angle <= 90:
+            frame = self._shown["top"].frames[index]
+            y = self.y
+        else:
+            frame = self._shown["bottom"].frames[index]
+            y = self.y + self.height - height
+        self._configure_item(self.flip_item, image=frame)
+        self._move_item(self.flip_item, self.x, y)
+    
+    def _draw_end(self):
+        sprites = self._shown["bottom"]
+        self._shown = {"top": sprites, "bottom": sprites}
+        self._configure_item(self.top_item, image=sprites.top)
+        self._configure_item(self.flip_item, state='hidden')
+    
+    def _draw_value(self, value):
+        sprites = self._sprites(value)
+        self._shown = {"top": sprites, "bottom": sprites}
+        self._configure_item(self.top_item, image=sprites.top)
+        self._configure_item(self.bottom_item, image=sprites.bottom)
+        self._configure_item(self.flip_item, state='hidden')
+    
+    def destroy(self):
+        self.animation_driver.remove(self)
+        self.canvas.delete(self.top_item, self.bottom_item, self.flip_item)
+
+class CanvasDigitGroup:
+    """
+    The canvas counterpart of DigitGroup: a run of CanvasCards plus a unit
+    caption text item, laid out by its CanvasCountdown.
+    """
+    def __init__(self, countdown, unit, min_digits=2):
+        self.countdown = countdown
+        self.min_digits = min_digits
+        self.cards = []
+        self._own_configure_calls = 0
+        self.unit_item = countdown.create_text(
+            0, 0,
+            text=unit,
+            font=countdown.unit_font,
+            fill=countdown.text_color
+        )
+        self._resize(min_digits)
+    
+    @property
+    def configure_calls(self):
+        return self._own_configure_calls + sum(card.configure_calls for card in self.cards)
+    
+    def move_caption(self, x, y):
+        self._own_configure_calls += 1
+        self.countdown.coords(self.unit_item, x, y)
+    
+    def _resize(self, digits):
+        while len(self.cards) < digits:
+            self.cards.insert(0, self.countdown.new_card())
+        while len(self.cards) > digits:
+            card = self.cards.pop(0)
+            self._own_configure_calls += card.configure_calls
+            card.destroy()
+    
+    def set_value(self, value, animate=True):
+        """
+        Shows a number string, one digit per card.
+        """
+        value = value.zfill(self.min_digits)
+        if len(value) != len(self.cards):
+            self._resize(len(value))
+            self.countdown.layout()
+        for card, digit in zip(self.cards, value):
+            if animate:
+                card.set_value(digit)
+            else:
+                card.snap_to(digit)
+
+class CanvasCountdown(tk.Canvas):
+    """
+    Alternative renderer that draws every card, digit and unit caption on a
+    single canvas. Items are created once and afterwards only updated in
+    place with itemconfigure and coords, so the countdown costs one widget
+    and one geometry pass instead of a CTkLabel stack per card.
+    
+    Card faces come from a FlipSpriteCache so the flip looks the same as
+    the sprite render mode. Spacing mirrors the packed DigitGroup layout.
+    """
+    def __init__(self, master, sprite_cache, animation_driver, scaling=1.0,
+                 units=("DAYS", "HOURS", "MINUTES", "SECONDS"), digit_width=40, height=100,
+                 font=('Consolas', 42, 'bold'), unit_font=('Arial', 10, 'bold'),
+                 text_color="#ffffff", bg="#1a1a1a"):
+        super().__init__(master, bg=bg, highlightthickness=0, bd=0)
         
-        # The flipping card starts showing the current value's top half
-        self.top_flipping_card.configure(text=self.current_value)
-        self.top_flipping_card.place(x=0, y=0)
-        self.top_flipping_card.lift() # Bring to front for animation
+        self.sprite_cache = sprite_cache
+        self.animation_driver = animation_driver
+        self.text_color = text_color
         
-        self.animate()
+        # Everything on the canvas is in pixels, scaled like the CTk widgets
+        self.card_width = round(digit_width * scaling)
+        self.card_height = round(height * scaling)
+        self.card_font = (font[0], round(font[1] * scaling), *font[2:])
+        self.unit_font = (unit_font[0], -round(unit_font[1] * scaling), *unit_font[2:])
+        self.digit_pad = round(1 * scaling)
+        self.group_pad = round(5 * scaling)
+        self.caption_pad = round(5 * scaling)
+        self.caption_height = round(28 * scaling)
+        half = self.card_height // 2
+        self.frame_heights = [
+            max(1, int(half * abs(math.cos(math.radians(angle)))))
+            for angle in range(0, 181, FlipCard.animation_speed)
+        ]
+        
+        self._size = None
+        self.groups = [CanvasDigitGroup(self, unit) for unit in units]
+        self.layout()
     
-    def animate(self):
+    def new_card(self):
+        return CanvasCard(self, self.sprite_cache, self.animation_driver, self.card_width,
+                          self.card_height, self.card_font, self.frame_heights)
+    
+    def layout(self):
         """
-        Performs the frame-by-frame animation of the flipping card.
+        Positions all cards and captions, and resizes the canvas to fit them.
+        Only needed at startup and when a group gains or loses a digit.
         """
-        if self.animation_step <= 180: # Flip from 0 to 180 degrees
-            angle = self.animation_step
-            self.animation_step += self.animation_speed
+        caption_y = self.card_height + self.caption_pad + self.caption_height // 2
+        x = 0
+        for group in self.groups:
+            x += self.group_pad
+            start = x
+            for card in group.cards:
+                x += self.digit_pad
+                card.move_to(x, 0)
+                x += self.card_width + self.digit_pad
+            group.move_caption((start + x) // 2, caption_y)
+            x += self.group_pad
+        
+        size = (x, self.card_height + self.caption_pad + self.caption_height)
+        if size != self._size:
+            self._size = size
+            self.configure(width=size[0], height=size[1])
+
+class SecondTicker:
+    """
+    Calls a callback once per displayed second, aimed just past each
+    wall-clock second boundary instead of chaining fixed after(1000) delays.
+    
+    Lateness is measured on the monotonic clock. When a tick is more than a
+    second late, or the wall clock jumps relative to the monotonic clock
+    (suspend/resume, NTP), the callback is told to resync so it can jump
+    straight to the current state instead of replaying missed flips.
+    
+    set_interval() slows the ticker down, e.g. to once a minute, with ticks
+    aligned to `phase` (a timestamp) so they land when the countdown's
+    visible value changes rather than on arbitrary wall-clock minutes.
+    """
+    def __init__(self, widget, callback, offset_ms=5, jump_threshold=1.5):
+        self.widget = widget
+        self.callback = callback
+        self.offset_ms = offset_ms
+        self.jump_threshold = jump_threshold
+        self.interval = 1
+        self.phase = 0.0
+        
+        self.lateness = 0.0 # Seconds the last tick fired after its target
+        self.ticks = 0
+        self.skipped = 0 # Seconds that passed without a tick of their own
+        self.resyncs = 0
+        
+        self._job = None
+        self._expected = None
+        self._last_wall = None
+        self._last_mono = None
+    
+    def start(self, resync=False):
+        """Runs one tick immediately and keeps ticking until stop()."""
+        self.stop()
+        self._expected = None
+        self._tick(resync)
+    
+    def set_interval(self, interval, phase=0.0):
+        """Changes the tick period in seconds, rescheduling a running ticker."""
+        if (interval, phase) == (self.interval, self.phase):
+            return
+        self.interval = interval
+        self.phase = phase
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._schedule()
+    
+    @property
+    def running(self):
+        return self._job is not None
+    
+    def stop(self):
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+    
+    def _schedule(self):
+        wall = time.time()
+        delay_ms = int((self.interval - (wall - self.phase) % self.interval) * 1000) + self.offset_ms
+        self._expected = time.monotonic() + delay_ms / 1000
+        self._job = self.widget.after(delay_ms, self._tick)
+    
+    def _tick(self, resync=False):
+        self._job = None
+        mono = time.monotonic()
+        wall = time.time()
+        
+        if self._expected is not None:
+            self.lateness = max(0.0, mono - self._expected)
+            if self.lateness >= self.interval:
+                self.skipped += int(self.lateness)
+                resync = True
+        if self._last_mono is not None:
+            # Both clocks advance together unless the wall clock was stepped
+            jump = (wall - self._last_wall) - (mono - self._last_mono)
+            if abs(jump) >= self.jump_threshold:
+                resync = True
+        self._last_wall = wall
+        self._last_mono = mono
+        
+        self.ticks += 1
+        if self._expected is not None:
+            METRICS.observe("tick_lateness_seconds", self.lateness)
+        if resync:
+            self.resyncs += 1
+            METRICS.inc("tick_resyncs_total")
+        try:
+            self.callback(resync)
+        finally:
+            self._schedule()
+
+class AlarmClock:
+    """
+    Fires the alarms of an AlarmSchedule from the Tk event loop.
+    
+    Exactly one after() job is pending, set for the next due alarm, so the
+    cost does not depend on how many thresholds are armed. Waits are capped
+    at max_wait seconds so a stepped wall clock is noticed within that time.
+    """
+    def __init__(self, widget, schedule, on_alarm, max_wait=3600):
+        self.widget = widget
+        self.schedule = schedule
+        self.on_alarm = on_alarm
+        self.max_wait = max_wait
+        self.fired = 0
+        self._job = None
+    
+    def reschedule(self):
+        """Re-arms the wakeup; call after adding, moving or removing alarms."""
+        self.stop()
+        delay = self.schedule.next_due(time.time())
+        if delay is not None:
+            self._job = self.widget.after(max(1, int(min(delay, self.max_wait) * 1000) + 5), self._wake)
+    
+    def stop(self):
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+    
+    def _wake(self):
+        self._job = None
+        try:
+            for alarm in self.schedule.due(time.time()):
+                self.fired += 1
+                if alarm.action is not None:
+                    alarm.action(alarm)
+                else:
+                    self.on_alarm(alarm)
+        finally:
+            self.reschedule()
+
+def run_notify_command(command, title, message):
+    """
+    Runs a user-supplied desktop notification command such as
+    'notify-send {title} {message}' without waiting for it.
+    """
+    import shlex
+    import subprocess
+    args = [part.format(title=title, message=message) for part in shlex.split(command)]
+    try:
+        subprocess.Popen(args, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except OSError as e:
+        print(f"Notify command failed: {e}")
+
+class TkCallQueue:
+    """
+    Runs functions on the Tk thread on behalf of other threads and hands
+    back a Future of the result.
+    
+    Where Tk supports file handlers (Unix), a byte written to a pipe wakes
+    the event loop, so nothing polls while the queue is empty; elsewhere the
+    queue is checked every poll_ms.
+    """
+    def __init__(self, widget, poll_ms=100):
+        self.widget = widget
+        self.poll_ms = poll_ms
+        self._queue = queue.SimpleQueue()
+        self._job = None
+        self._read_fd = self._write_fd = None
+        try:
+            self._read_fd, self._write_fd = os.pipe()
+            os.set_blocking(self._read_fd, False)
+            widget.tk.createfilehandler(self._read_fd, tk.READABLE, self._on_wakeup)
+        except (AttributeError, OSError):
+            # Fall back to polling, without leaking a pipe that was opened
+            for fd in (self._read_fd, self._write_fd):
+                if fd is not None:
+                    os.close(fd)
+            self._read_fd = self._write_fd = None
+            self._job = widget.after(poll_ms, self._poll)
+    
+    def call(self, function, *args):
+        """Queues function(*args) for the Tk thread; safe from any thread."""
+        future = Future()
+        self._queue.put((future, function, args))
+        if self._write_fd is not None:
+            os.write(self._write_fd, b"x")
+        return future
+    
+    def _on_wakeup(self, fd, mask):
+        try:
+            os.read(fd, 512)
+        except BlockingIOError:
+            pass
+        self._run_pending()
+    
+    def _poll(self):
+        self._run_pending()
+        self._job = self.widget.after(self.poll_ms, self._poll)
+    
+    def _run_pending(self):
+        while True:
+            try:
+                future, function, args = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(function(*args))
+            except Exception as e:
+                future.set_exception(e)
+    
+    def close(self):
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+        if self._read_fd is not None:
+            self.widget.tk.deletefilehandler(self._read_fd)
+            os.close(self._read_fd)
+            os.close(self._write_fd)
+            self._read_fd = self._write_fd = None
+
+class MetricsOverlay(ctk.CTkToplevel):
+    """
+    A small always-on-top window showing the live runtime metrics.
+    It refreshes once a second and only while it is open.
+    """
+    def __init__(self, master, metrics, text_color="#ffffff", bg_color="#1a1a1a"):
+        super().__init__(master, fg_color=bg_color)
+        self.title("Doom Counter Metrics")
+        self.attributes("-topmost", True)
+        self.resizable(False, False)
+        
+        self.metrics = metrics
+        self._job = None
+        self._last_cpu = (time.monotonic(), time.process_time())
+        self._shown = ""
+        
+        self.label = ctk.CTkLabel(self, text="", text_color=text_color, font=('Consolas', 11),
+                                  justify='left', anchor='w')
+        self.label.pack(padx=12, pady=10)
+        self.refresh()
+    
+    def refresh(self):
+        self._job = None
+        metrics = self.metrics
+        metrics.sample_process()
+        
+        wall, cpu = time.monotonic(), time.process_time()
+        cpu_percent = 100 * (cpu - self._last_cpu[1]) / max(1e-6, wall - self._last_cpu[0])
+        self._last_cpu = (wall, cpu)
+        
+        def ms(name):
+            h = metrics.histogram(name)
+            return f"p50 {h.quantile(0.5) * 1000:6.1f}  p99 {h.quantile(0.99) * 1000:6.1f}  max {h.max * 1000:6.1f} ms"
+        
+        calls = metrics.histogram("configure_calls_per_tick", COUNT_BUCKETS)
+        rss = metrics.gauges.get("process_resident_memory_bytes")
+        lines = [
+            f"tick lateness   {ms('tick_lateness_seconds')}",
+            f"frame time      {ms('animation_frame_seconds')}",
+            f"dropped frames  {metrics.counters.get('animation_dropped_frames_total', 0)}",
+            f"configure/tick  p50 {calls.quantile(0.5):g}  p99 {calls.quantile(0.99):g}  max {calls.max:g}",
+            f"RSS             {rss / 2**20:.1f} MB" if rss is not None else "RSS             n/a",
+            f"CPU             {cpu_percent:.1f} %",
+        ]
+        text = "\n".join(lines)
+        if text != self._shown:
+            self.label.configure(text=text)
+            self._shown = text
+        self._job = self.after(1000, self.refresh)
+    
+    def destroy(self):
+        if self._job is not None:
+            self.after_cancel(self._job)
+            self._job = None
+        super().destroy()
+
+class DeadlineListWindow(ctk.CTkToplevel):
+    """
+    A paged "next N" view of the deadlines in a CountdownEngine.
+    
+    Rows are created once per page slot and only reconfigured when their
+    text changes. The window wakes only when a shown value ticks over or the
+    next deadline expires, as reported by CountdownEngine.next_change.
+    """
+    def __init__(self, master, engine, page_size=10, text_color="#ffffff", accent_color="#ff4d4d",
+                 button_bg="#2b2b2b", hover_color="#ff1a1a", bg_color="#1a1a1a"):
+        super().__init__(master, fg_color=bg_color)
+        self.title("Upcoming Deadlines")
+        self.attributes("-topmost", True)
+        
+        self.engine = engine
+        self.page_size = page_size
+        self.page = 0
+        self._job = None
+        
+        rows_frame = ctk.CTkFrame(self, fg_color="transparent")
+        rows_frame.pack(fill='both', expand=True, padx=15, pady=(15, 5))
+        
+        # (name label, time label, last texts shown) per page slot
+        self.rows = []
+        for index in range(page_size):
+            name_label = ctk.CTkLabel(rows_frame, text="", text_color=text_color,
+                                      font=('Arial', 11, 'bold'), anchor='w', width=200)
+            name_label.grid(row=index, column=0, sticky='w')
+            time_label = ctk.CTkLabel(rows_frame, text="", text_color=accent_color,
+                                      font=('Consolas', 12, 'bold'), anchor='e', width=120)
+            time_label.grid(row=index, column=1, sticky='e', padx=(10, 0))
+            self.rows.append([name_label, time_label, "", ""])
+        
+        nav_frame = ctk.CTkFrame(self, fg_color="transparent")
+        nav_frame.pack(fill='x', padx=15, pady=(5, 15))
+        
+        button_options = dict(fg_color=button_bg, hover_color=hover_color, width=60, height=28,
+                              corner_radius=5, font=('Arial', 10, 'bold'))
+        ctk.CTkButton(nav_frame, text="PREV", command=lambda: self.turn_page(-1),
+                      **button_options).pack(side='left')
+        ctk.CTkButton(nav_frame, text="NEXT", command=lambda: self.turn_page(1),
+                      **button_options).pack(side='right')
+        self.page_label = ctk.CTkLabel(nav_frame, text="", text_color=text_color, font=('Arial', 10, 'bold'))
+        self.page_label.pack(side='left', expand=True)
+        
+        self.refresh()
+    
+    def turn_page(self, step):
+        pages = max(1, math.ceil(len(self.engine) / self.page_size))
+        self.page = min(max(0, self.page + step), pages - 1)
+        self.refresh()
+    
+    def refresh(self):
+        """
+        Redraws the visible page and schedules the next wakeup.
+        """
+        if self._job is not None:
+            self.after_cancel(self._job)
+            self._job = None
+        
+        now = time.time()
+        self.engine.expire(now)
+        pages = max(1, math.ceil(len(self.engine) / self.page_size))
+        self.page = min(self.page, pages - 1)
+        shown = self.engine.next_n(self.page_size, self.page * self.page_size)
+        
+        for index, row in enumerate(self.rows):
+            if index < len(shown):
+                name, remaining = shown[index].name, format_remaining(shown[index].remaining(now))
+            else:
+                name, remaining = "", ""
+            if name != row[2]:
+                row[0].configure(text=name)
+                row[2] = name
+            if remaining != row[3]:
+                row[1].configure(text=remaining)
+                row[3] = remaining
+        self.page_label.configure(text=f"{self.page + 1}/{pages}  ({len(self.engine)} upcoming)")
+        
+        delay = self.engine.next_change(shown, now)
+        if delay is not None:
+            self._job = self.after(max(1, int(delay * 1000) + 5), self.refresh)
+    
+    def destroy(self):
+        if self._job is not None:
+            self.after_cancel(self._job)
+            self._job = None
+        super().destroy()
+
+def list_monitors():
+    """
+    (left, top, right, bottom) of every monitor in screen coordinates, the
+    work area without task bars on Windows; empty where monitors cannot be
+    listed. Runs xrandr on X11, which can take up to a second, so see
+    MonitorAreas rather than calling this from the Tk thread.
+    """
+    import subprocess
+    areas = []
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            from ctypes import wintypes
             
-            # Calculate perspective scale for the flipping card
-            # Scale goes from 1 down to 0 and back to 1
-            scale = math.cos(math.radians(angle))
-            height = max(1, int((self.height / 2) * abs(scale)))
+            class MONITORINFO(ctypes.Structure):
+                _fields_ = [("cbSize", wintypes.DWORD), ("rcMonitor", wintypes.RECT),
+                            ("rcWork", wintypes.RECT), ("dwFlags", wintypes.DWORD)]
             
-            if angle <= 90:
-                # First half of the flip: top card flips down, revealing its back (which is the bottom_half of the next value)
-                self.top_flipping_card.configure(text_color="#ff4d4d", fg_color="#2b2b2b") # Front side color
-                self.top_flipping_card.configure(height=height)
-                self.top_flipping_card.place_configure(y=0)
-                self.top_flipping_card.lift()
-            else:
-                # Second half of the flip: top card continues flipping, now showing the next value's top half
-                # It appears to come up from the bottom, but it's actually just the top_flipping_card changing its text
-                self.top_flipping_card.configure(text=self.next_value)
-                self.top_flipping_card.configure(text_color="#ff4d4d", fg_color="#2b2b2b") # Back side color
-                self.top_flipping_card.configure(height=height)
-                self.top_flipping_card.place_configure(y=self.height - height) # Adjust y to simulate flipping up
-                self.top_flipping_card.lift()
-
-            self.after(20, self.animate) # Continue animation
+            def add_monitor(monitor, dc, rect, data):
+                info = MONITORINFO()
+                info.cbSize = ctypes.sizeof(info)
+                if ctypes.windll.user32.GetMonitorInfoW(monitor, ctypes.byref(info)):
+                    work = info.rcWork
+                    areas.append((work.left, work.top, work.right, work.bottom))
+                return True
+            
+            callback = ctypes.WINFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p,
+                                          ctypes.POINTER(wintypes.RECT), ctypes.c_void_p)(add_monitor)
+            ctypes.windll.user32.EnumDisplayMonitors(None, None, callback, 0)
+        elif os.environ.get("DISPLAY"):
+            output = subprocess.run(["xrandr", "--listactivemonitors"], capture_output=True,
+                                    text=True, timeout=1).stdout
+            # " 0: +*DP-1 2560/597x1440/336+0+0  DP-1"
+            for width, height, x, y in re.findall(r"(\d+)/\d+x(\d+)/\d+\+(\d+)\+(\d+)", output):
+                areas.append((int(x), int(y), int(x) + int(width), int(y) + int(height)))
+    except (OSError, AttributeError, ValueError, subprocess.SubprocessError):
+        areas = []
+    return tuple(areas)
+
+
+class MonitorAreas:
+    """
+    The monitor areas of a widget's screen, listed once per screen size
+    (which changes when monitors are added or removed) on a background
+    thread, so neither startup nor a drag waits for xrandr. Until the list
+    arrives, or where monitors cannot be listed, the whole screen counts
+    as one monitor. On X11 that is the union of all monitors, so only the
+    snapping edges between monitors are missing meanwhile.
+    """
+    def __init__(self, widget):
+        self.widget = widget
+        self._areas = {} # (screen width, screen height) -> areas
+        self._listing = set()
+    
+    def get(self):
+        size = (self.widget.winfo_screenwidth(), self.widget.winfo_screenheight())
+        areas = self._areas.get(size)
+        if areas is None:
+            if sys.platform == "win32":
+                # EnumDisplayMonitors is a quick in-process call
+                areas = self._areas[size] = list_monitors()
+            elif size not in self._listing:
+                self._listing.add(size)
+                threading.Thread(target=self._list, args=(size,), name="doomcounter-monitors",
+                                 daemon=True).start()
+        return areas or ((0, 0, *size),)
+    
+    def _list(self, size):
+        self._areas[size] = list_monitors()
+
+class WindowMover:
+    """
+    Moves an undecorated window with the mouse, and resizes it from a grip.
+    
+    Motion events only record where the pointer is. The window is changed
+    by one after() job per frame that applies the latest position, so
+    however fast the mouse reports there is at most one geometry request
+    per frame and flip animations keep their share of the event loop.
+    
+    Presses on buttons and entries are left to them. A moved window snaps
+    to the edges of the monitor its centre is on when it comes within
+    `snap` pixels; hold Shift to place it freely. A resized window never
+    gets smaller than its content.
+    """
+    CONTROLS = (ctk.CTkButton, ctk.CTkEntry, tk.Button, tk.Entry)
+    
+    def __init__(self, window, monitors, on_done=None, frame_ms=16, snap=12):
+        self.window = window
+        self.monitors = monitors # MonitorAreas
+        self.on_done = on_done
+        self.frame_ms = frame_ms
+        self.snap = snap
+        
+        self.events = 0 # Motion events seen
+        self.updates = 0 # Geometry requests made
+        
+        self._mode = None # "move" or "resize" while the button is down
+        self._start = None # Pointer position and window geometry at the press
+        self._pixels = None # Window size in pixels at the press, for snapping
+        self._min_size = None
+        self._pointer = None
+        self._free = False
+        self._geometry = None # Last geometry applied, as "WxH+X+Y"
+        self._job = None
+        
+        window.bind("<ButtonPress-1>", self.press, add="+")
+        window.bind("<B1-Motion>", self.motion, add="+")
+        window.bind("<ButtonRelease-1>", self.release, add="+")
+    
+    def add_grip(self, grip):
+        """Makes dragging `grip` resize the window instead of moving it."""
+        grip.bind("<ButtonPress-1>", self._press_grip)
+    
+    def _press_grip(self, event):
+        self.press(event, "resize")
+        return "break" # Not a move as well
+    
+    def _is_control(self, widget):
+        while widget is not None and widget is not self.window:
+            if isinstance(widget, self.CONTROLS):
+                return True
+            widget = widget.master
+        return False
+    
+    def press(self, event, mode="move"):
+        if isinstance(event.widget, str) or self._is_control(event.widget):
+            return
+        window = self.window
+        # Sizes as CTk takes them (unscaled), positions in pixels
+        match = re.match(r"(\d+)x(\d+)\+(-?\d+)\+(-?\d+)", window.geometry())
+        if match is None:
+            return
+        self._mode = mode
+        self._start = (event.x_root, event.y_root, *(int(n) for n in match.groups()))
+        self._pixels = (window.winfo_width(), window.winfo_height())
+        self._min_size = (window._reverse_window_scaling(window.winfo_reqwidth()),
+                          window._reverse_window_scaling(window.winfo_reqheight()))
+        self._pointer = (event.x_root, event.y_root)
+        self._geometry = None
+    
+    def motion(self, event):
+        if self._mode is None:
+            return
+        self.events += 1
+        self._pointer = (event.x_root, event.y_root)
+        self._free = bool(event.state & 0x0001) # Shift
+        if self._job is None:
+            self._job = self.window.after(self.frame_ms, self._apply)
+    
+    def release(self, event):
+        if self._mode is None:
+            return
+        if self._job is not None:
+            self.window.after_cancel(self._job)
+        self._pointer = (event.x_root, event.y_root)
+        self._apply()
+        self._mode = None
+        if self._geometry is not None and self.on_done is not None:
+            self.on_done(self._geometry)
+    
+    def stop(self):
+        if self._job is not None:
+            self.window.after_cancel(self._job)
+            self._job = None
+        self._mode = None
+    
+    def _apply(self):
+        self._job = None
+        start_x, start_y, width, height, x, y = self._start
+        dx, dy = self._pointer[0] - start_x, self._pointer[1] - start_y
+        if dx == dy == 0 and self._geometry is None:
+            return # A click, not a drag
+        if self._mode == "resize":
+            width = max(self._min_size[0], width + self.window._reverse_window_scaling(dx))
+            height = max(self._min_size[1], height + self.window._reverse_window_scaling(dy))
+            request = f"{width}x{height}"
         else:
-            # Animation complete
-            self.current_value = self.next_value
-            self.top_half.configure(text=self.current_value)
-            self.bottom_half.configure(text=self.current_value)
-            self.top_flipping_card.lower() # Hide the flipping card
-            self.is_animating = False
+            x, y = x + dx, y + dy
+            if not self._free:
+                x, y = self._snapped(x, y, *self._pixels)
+            request = f"+{x}+{y}"
+        geometry = f"{width}x{height}+{x}+{y}"
+        if geometry != self._geometry:
+            self.window.geometry(request)
+            self._geometry = geometry
+            self.updates += 1
+    
+    def _snapped(self, x, y, width, height):
+        center_x, center_y = x + width // 2, y + height // 2
+        areas = self.monitors.get()
+        # The monitor under the window's centre, else the nearest one
+        left, top, right, bottom = min(areas, key=lambda area: (
+            max(area[0] - center_x, 0, center_x - area[2]) + max(area[1] - center_y, 0, center_y - area[3])))
+        if abs(x - left) <= self.snap:
+            x = left
+        elif abs(x + width - right) <= self.snap:
+            x = right - width
+        if abs(y - top) <= self.snap:
+            y = top
+        elif abs(y + height - bottom) <= self.snap:
+            y = bottom - height
+        return x, y
 
-class DoomCounter(ctk.CTk):
+class CounterView:
     """
-    Main application class for the Doom Counter.
-    Displays a countdown to a specified date and time.
+    The countdown view of one deadline: date line, flip cards, buttons,
+    compact bar and dragging. Mixed into the main DoomCounter window and
+    into every extra CounterWindow.
+    
+    Everything that can be shared lives on the app (the DoomCounter): the
+    tick loop, alarms, the sprite cache and the animation driver, so an
+    extra view costs its widgets and nothing else.
     """
-    def __init__(self):
-        super().__init__()
+    def build_counter(self, app, name=None, geometry="500x300+100+100"):
+        """
+        Creates the widgets of the view. self.doom_date, self.doom_date_str
+        and self.doom_schedule must already be set.
+        """
+        self.app = app
+        self.name = name
         
         # Configure window
-        self.title("Doom Counter")
+        self.title(f"Doom Counter - {name}" if name else "Doom Counter")
         self.attributes("-topmost", True)  # Keep window on top
         self.overrideredirect(True)  # Remove window decorations (title bar, borders)
         
         # Window state
         self.is_hidden = False
-        self.normal_geometry = "500x300+100+100"  # Store the normal window size
-        self.hidden_geometry = "200x50+100+100"   # Store the minimized window size
-        
-        # Set theme and colors
-        ctk.set_appearance_mode("dark")
-        ctk.set_default_color_theme("dark-blue")
+        self.is_mapped = True # Cleared while iconified or withdrawn
+        self.normal_geometry = geometry  # Store the normal window size
+        x, y = geometry.split("+", 1)[1].split("+")
+        self.hidden_geometry = f"200x50+{x}+{y}"   # Store the minimized window size
         
         # Custom colors
-        self.bg_color = "#1a1a1a"
-        self.fg_color = "#ff4d4d"
-        self.accent_color = "#ff1a1a"
-        self.text_color = "#ffffff"
-        self.button_bg = "#2b2b2b"
+        self.bg_color = THEME["bg"]
+        self.fg_color = THEME["fg"]
+        self.accent_color = THEME["accent"]
+        self.text_color = THEME["text"]
+        self.button_bg = THEME["button_bg"]
         
         # Configure window background color
         self.geometry(self.normal_geometry)
@@ -182,7 +1377,7 @@ class DoomCounter(ctk.CTk):
         # Left side - Title
         self.minimized_title = ctk.CTkLabel(
             self.minimized_content, 
-            text="DOOM:",
+            text=f"{name.upper()}:" if name else "DOOM:",
             text_color=self.text_color,
             font=('Arial', 12, 'bold'),
             anchor='w'
@@ -220,17 +1415,13 @@ class DoomCounter(ctk.CTk):
         self.main_frame = ctk.CTkFrame(self, fg_color="transparent")
         self.main_frame.pack(fill='both', expand=True, padx=20, pady=15)
         
-        # Load or set doom date
-        self.doom_date_str = "2025-06-01 00:00:00" # Default doom date
-        self.load_or_set_doom_date()
-        
         # Date display frame
         self.date_frame = ctk.CTkFrame(self.main_frame, fg_color="transparent")
         self.date_frame.pack(fill='x', pady=(0, 10))
         
         self.date_label = ctk.CTkLabel(
             self.date_frame, 
-            text="DOOM DATE: ",
+            text=f"{name.upper()}: " if name else "DOOM DATE: ",
             text_color=self.text_color,
             font=('Arial', 10, 'bold'),
             anchor='w'
@@ -239,7 +1430,7 @@ class DoomCounter(ctk.CTk):
         
         self.date_display = ctk.CTkLabel(
             self.date_frame, 
-            text=self.doom_date_str,
+            text=self.date_display_text(),
             text_color=self.fg_color,
             font=('Arial', 10, 'bold'),
             anchor='w'
@@ -254,28 +1445,46 @@ class DoomCounter(ctk.CTk):
         self.card_container = ctk.CTkFrame(self.countdown_frame, fg_color="transparent")
         self.card_container.pack(expand=True)
         
-        # Initialize flipping card labels for Days, Hours, Minutes, Seconds
-        self.days_label = FlippingLabel(self.card_container, width=80, height=100)
-        self.days_label.pack(side='left', padx=5)
+        if app.render_mode == "canvas":
+            # Everything drawn on one canvas, updated in place
+            self.countdown_canvas = CanvasCountdown(
+                self.card_container,
+                app.sprite_cache,
+                app.animation_driver,
+                scaling=self.card_container._apply_widget_scaling(1.0),
+                text_color=self.text_color,
+                bg=self.bg_color
+            )
+            self.countdown_canvas.pack()
+            self.days_group, self.hours_group, self.minutes_group, self.seconds_group = self.countdown_canvas.groups
+        else:
+            # One group of single-digit flipping cards each for Days, Hours, Minutes, Seconds
+            card_options = dict(
+                text_color=self.text_color,
+                render_mode=app.render_mode,
+                sprite_cache=app.sprite_cache,
+                animation_driver=app.animation_driver
+            )
+            self.days_group = DigitGroup(self.card_container, "DAYS", **card_options)
+            self.days_group.pack(side='left', padx=5, anchor='n')
         
-        self.hours_label = FlippingLabel(self.card_container, width=80, height=100)
-        self.hours_label.pack(side='left', padx=5)
+            self.hours_group = DigitGroup(self.card_container, "HOURS", **card_options)
+            self.hours_group.pack(side='left', padx=5, anchor='n')
         
-        self.minutes_label = FlippingLabel(self.card_container, width=80, height=100)
-        self.minutes_label.pack(side='left', padx=5)
+            self.minutes_group = DigitGroup(self.card_container, "MINUTES", **card_options)
+            self.minutes_group.pack(side='left', padx=5, anchor='n')
         
-        self.seconds_label = FlippingLabel(self.card_container, width=80, height=100)
-        self.seconds_label.pack(side='left', padx=5)
+            self.seconds_group = DigitGroup(self.card_container, "SECONDS", **card_options)
+            self.seconds_group.pack(side='left', padx=5, anchor='n')
         
-        # Time unit labels (DAYS, HOURS, etc.)
-        units_frame = ctk.CTkFrame(self.countdown_frame, fg_color="transparent")
-        units_frame.pack(fill='x', pady=(5, 0))
+        self.groups = (self.days_group, self.hours_group, self.minutes_group, self.seconds_group)
         
-        unit_font = ('Arial', 10, 'bold')
-        ctk.CTkLabel(units_frame, text="DAYS", font=unit_font, text_color=self.text_color).pack(side='left', padx=28, expand=True)
-        ctk.CTkLabel(units_frame, text="HOURS", font=unit_font, text_color=self.text_color).pack(side='left', padx=28, expand=True)
-        ctk.CTkLabel(units_frame, text="MINUTES", font=unit_font, text_color=self.text_color).pack(side='left', padx=15, expand=True)
-        ctk.CTkLabel(units_frame, text="SECONDS", font=unit_font, text_color=self.text_color).pack(side='left', padx=15, expand=True)
+        # Last state pushed to the widgets, used to skip unchanged ones
+        self._rendered_values = tuple("".join(card.current_value for card in group.cards) for group in self.groups)
+        self._rendered_time_str = self.minimized_time.cget("text")
+        
+        # Widget configure calls of the compact bar; the cards count their own
+        self.configure_calls = 0
         
         # Button frame
         self.button_frame = ctk.CTkFrame(self.main_frame, fg_color="transparent")
@@ -308,6 +1517,20 @@ class DoomCounter(ctk.CTk):
         )
         self.hide_btn.pack(side='left', padx=5)
         
+        if app.engine is not None:
+            self.list_btn = ctk.CTkButton(
+                self.button_frame,
+                text="LIST",
+                command=app.show_deadline_list,
+                fg_color=self.button_bg,
+                hover_color=self.accent_color,
+                width=100,
+                height=30,
+                corner_radius=5,
+                font=('Arial', 10, 'bold')
+            )
+            self.list_btn.pack(side='left', padx=5)
+        
         self.close_btn = ctk.CTkButton(
             self.button_frame,
             text="X",
@@ -321,35 +1544,35 @@ class DoomCounter(ctk.CTk):
         )
         self.close_btn.pack(side='right')
         
-        # Event bindings for dragging and closing
+        # Event bindings for closing, shortcuts and visibility
         self.bind("<Escape>", lambda e: self.destroy()) # Close on Escape key
-        self.bind("<ButtonPress-1>", self.on_press_drag) # Start drag on left mouse button press
-        self.bind("<B1-Motion>", self.on_drag) # Continue drag on mouse motion with left button held
+        self.bind("<F12>", app.toggle_metrics_overlay) # Live metrics
+        self.bind("<Control-n>", lambda e: app.open_window(show_picker=True)) # Another countdown
+        self.bind("<Unmap>", self.on_map_change) # No ticks while iconified
+        self.bind("<Map>", self.on_map_change)
         
-        # Start the countdown update loop
-        self.update_countdown()
+        # Dragging moves the window and the corner grip resizes it, one geometry change per frame
+        self.mover = WindowMover(self, app.monitors, on_done=self.on_moved)
+        self.resize_grip = tk.Label(self, text="◢", bg=self.bg_color, fg="#4a4a4a", bd=0,
+                                    font=('Arial', 10), cursor="bottom_right_corner")
+        self.resize_grip.place(relx=1.0, rely=1.0, anchor='se')
+        self.mover.add_grip(self.resize_grip)
     
-    def load_or_set_doom_date(self):
-        """
-        Loads the doom date from a file or sets a default if not found/invalid.
-        """
-        try:
-            # Try to load from file
-            if os.path.exists('doom_date.txt'):
-                with open('doom_date.txt', 'r') as f:
-                    self.doom_date_str = f.read().strip()
-            self.doom_date = datetime.strptime(self.doom_date_str, "%Y-%m-%d %H:%M:%S")
-        except (ValueError, FileNotFoundError):
-            # Default to 7 days from now if error
-            self.doom_date = datetime.now() + timedelta(days=7)
-            self.doom_date_str = self.doom_date.strftime("%Y-%m-%d %H:%M:%S")
+    @property
+    def card_configure_calls(self):
+        """Configure calls of the compact bar and all cards of this view."""
+        return self.configure_calls + sum(group.configure_calls for group in self.groups)
+    
+    def date_display_text(self):
+        """The doom date line, with the rule it came from if it recurs."""
+        if self.doom_schedule is not None:
+            return f"{self.doom_date_str}  ({self.doom_schedule.text})"
+        return self.doom_date_str
     
     def save_doom_date(self):
         """
-        Saves the current doom date to a file.
+        Only the main window's doom date is stored; see DoomCounter.
         """
-        with open('doom_date.txt', 'w') as f:
-            f.write(self.doom_date_str)
     
     def show_date_picker(self):
         """
@@ -363,7 +1586,7 @@ class DoomCounter(ctk.CTk):
         
         # Center the date picker window
         window_width = 350
-        window_height = 220
+        window_height = 300
         x = (self.winfo_screenwidth() - window_width) // 2
         y = (self.winfo_screenheight() - window_height) // 2
         date_picker.geometry(f"{window_width}x{window_height}+{x}+{y}")
@@ -381,18 +1604,25 @@ class DoomCounter(ctk.CTk):
         time_frame = ctk.CTkFrame(date_picker, fg_color="transparent")
         time_frame.pack(pady=(0, 20), padx=20, fill='x')
         
-        ctk.CTkLabel(time_frame, text="TIME (HH:MM:SS):").pack(anchor='w')
+        ctk.CTkLabel(time_frame, text="TIME (HH:MM:SS [TIME ZONE]):").pack(anchor='w')
         time_entry = ctk.CTkEntry(time_frame, width=300, height=35, font=('Arial', 12))
         time_entry.pack(pady=(5, 10))
         time_entry.insert(0, self.doom_date.strftime("%H:%M:%S"))
         
+        # Recurrence rule, used instead of date and time when given
+        ctk.CTkLabel(time_frame, text="OR REPEAT (e.g. every fri 17:00 Europe/Berlin):").pack(anchor='w')
+        repeat_entry = ctk.CTkEntry(time_frame, width=300, height=35, font=('Arial', 12))
+        repeat_entry.pack(pady=(5, 0))
+        if self.doom_schedule is not None and self.doom_schedule.kind != "once":
+            repeat_entry.insert(0, self.doom_schedule.text)
+        
         # Buttons
         btn_frame = ctk.CTkFrame(date_picker, fg_color="transparent")
         btn_frame.pack(pady=(0, 20))
         
         def set_date():
             """Callback function to set the doom date from the entry fields."""
-            self.set_doom_date(f"{date_entry.get()} {time_entry.get()}")
+            self.set_doom_date(repeat_entry.get().strip() or f"{date_entry.get()} {time_entry.get()}")
             date_picker.destroy()
         
         ctk.CTkButton(
@@ -421,28 +1651,45 @@ class DoomCounter(ctk.CTk):
         date_entry.select_range(0, 'end')
         date_entry.bind('<Return>', lambda e: set_date())
         time_entry.bind('<Return>', lambda e: set_date())
+        repeat_entry.bind('<Return>', lambda e: set_date())
     
     def set_doom_date(self, date_time_str):
         """
         Sets the doom date based on the provided string and handles validation.
+        The string may also carry a time zone or be a recurrence rule.
         """
         try:
-            new_date = datetime.strptime(date_time_str, "%Y-%m-%d %H:%M:%S")
+            new_date, schedule = parse_doom_date(date_time_str)
             if new_date <= datetime.now():
                 # Using messagebox for confirmation as it's a Toplevel window
                 if not messagebox.askyesno("Warning", "The selected date is in the past. Continue?"):
                     return
-            
-            self.doom_date = new_date
-            self.doom_date_str = date_time_str
-            self.date_display.configure(text=date_time_str)
-            self.save_doom_date()
-            
-            # Force update the display to reflect new date immediately
-            self.update_display()
+            self.apply_doom_date(new_date, schedule=schedule, reason="picker")
             
         except ValueError as e:
-            messagebox.showerror("Error", "Invalid date/time format.\nPlease use YYYY-MM-DD HH:MM:SS\nExample: 2025-12-25 23:59:59")
+            messagebox.showerror("Error", f"{e}\nPlease use YYYY-MM-DD HH:MM:SS [time zone] or a rule\n"
+                                          "Example: 2025-12-25 23:59:59 or every friday 17:00 Europe/Berlin")
+    
+    def apply_doom_date(self, new_date, save=True, schedule=None, reason="set"):
+        """
+        Switches the view to a new, already validated doom date without
+        asking anything, and saves it unless save is False. `schedule` is
+        the Schedule the date came from, if any; `reason` is what the event
+        log records as the cause of the change.
+        """
+        previous = self.doom_date
+        self.doom_date = new_date
+        self.doom_date_str = new_date.strftime(DATE_FORMAT)
+        self.doom_schedule = schedule
+        self.date_display.configure(text=self.date_display_text())
+        if save:
+            self.save_doom_date()
+        
+        # Move the alarms along with the date, realign compact ticks and log the change
+        self.app.deadline_moved(self, previous, reason)
+        
+        # Force update the display to reflect new date immediately
+        self.update_display()
     
     def toggle_hide_show(self, event=None):
         """Toggle between showing and hiding the window"""
@@ -451,8 +1698,10 @@ class DoomCounter(ctk.CTk):
             self.overrideredirect(True)
             self.main_frame.pack(fill='both', expand=True, padx=20, pady=15)
             self.minimized_frame.pack_forget()
+            self.resize_grip.place(relx=1.0, rely=1.0, anchor='se')
             self.geometry(self.normal_geometry)
             self.is_hidden = False
+            self.apply_power_mode()
         else:
             # Save current position and minimize
             x, y = self.winfo_x(), self.winfo_y()
@@ -461,85 +1710,818 @@ class DoomCounter(ctk.CTk):
             
             # Show minimized frame
             self.main_frame.pack_forget()
+            self.resize_grip.place_forget()
             self.minimized_frame.pack(fill='both', expand=True)
             self.overrideredirect(False)  # Show title bar when minimized
             self.geometry(self.hidden_geometry)
             self.is_hidden = True
             self.lift()
+            self.apply_power_mode()
+    
+    def apply_power_mode(self):
+        """
+        Lets the app match the shared tick rate to what is on screen and
+        jumps this view straight to the current state.
+        """
+        self.app.update_tick_rate()
+        self.update_display(animate=False)
+    
+    def on_map_change(self, event):
+        """
+        Stops ticking this view while it is unmapped (iconified or withdrawn)
+        and resyncs it without animation when it is mapped again.
+        """
+        if event.widget is not self:
+            return
+        self.is_mapped = event.type == tk.EventType.Map
+        if self.is_mapped:
+            self.update_display(animate=False)
+        self.app.update_tick_rate()
             
-    def update_display(self):
+    def update_display(self, animate=True, now=None):
         """
-        Calculates the time left and updates the flipping labels.
+        Calculates the time left at `now` (default: the current time) and
+        updates the flipping labels. With animate=False the cards jump
+        straight to the new values.
+        
+        The new state is diffed against the last rendered one, so only cards
+        whose value actually changed are touched. In the compact view only
+        the compact label is updated, since the cards are off-screen.
         """
         try:
-            now = datetime.now()
-            time_left = self.doom_date - now
-            
-            # Format time left as days, hours, minutes, seconds
-            if time_left.total_seconds() <= 0:
-                time_str = "DOOMSDAY!"
-            else:
-                days = time_left.days
-                seconds = time_left.seconds
-                hours = seconds // 3600
-                minutes = (seconds % 3600) // 60
-                seconds = seconds % 60
-                time_str = f"{days:02d}d {hours:02d}:{minutes:02d}:{seconds:02d}"
+            remaining = remaining_seconds(self.doom_date, now)
+            if remaining <= -ROLLOVER_SECONDS and self.roll_over(now):
+                return
+            values = countdown_values(remaining)
+            # Seconds would be stale between slow compact ticks, so leave them out
+            time_str = format_remaining(remaining, show_seconds=self.app.compact_interval < 60)
             
             # Update minimized window display
             if self.is_hidden:
-                self.minimized_time.configure(text=time_str)
-            
-            # If countdown is over
-            if time_left.total_seconds() <= 0:
-                self.days_label.set_value("00")
-                self.hours_label.set_value("00")
-                self.minutes_label.set_value("00")
-                self.seconds_label.set_value("00")
+                if time_str != self._rendered_time_str:
+                    self.configure_calls += 1
+                    self.minimized_time.configure(text=time_str)
+                    self._rendered_time_str = time_str
                 return
             
-            # Calculate time components
-            days = time_left.days
-            hours, remainder = divmod(time_left.seconds, 3600)
-            minutes, seconds = divmod(remainder, 60)
-            
-            # Update cards with animation
-            # Ensure two digits for each value
-            self.days_label.set_value(f"{days:02d}")
-            self.hours_label.set_value(f"{hours:02d}")
-            self.minutes_label.set_value(f"{minutes:02d}")
-            self.seconds_label.set_value(f"{seconds:02d}")
+            # Update cards with animation, only changed digits flip
+            for index, (group, value) in enumerate(zip(self.groups, values)):
+                if value != self._rendered_values[index]:
+                    group.set_value(value, animate)
+            self._rendered_values = values
             
         except Exception as e:
+            METRICS.inc("update_errors_total")
             print(f"Error updating display: {e}")
     
-    def update_countdown(self):
+    def roll_over(self, now=None):
         """
-        Schedules the update_display function to run every second.
+        Moves a recurring doom date that has been reached on to its next
+        occurrence. Returns False if the date does not recur.
         """
-        self.update_display()
-        self.after(1000, self.update_countdown) # Call itself after 1 second
+        schedule = self.doom_schedule
+        if schedule is None or schedule.kind == "once":
+            return False
+        next_date = schedule.next_after((now or datetime.now()).timestamp())
+        if next_date is None:
+            return False
+        # The rule itself is what is stored, so there is nothing to save
+        self.apply_doom_date(next_date, save=False, schedule=schedule, reason="rollover")
+        return True
     
-    def on_press_drag(self, event):
+    def on_moved(self, geometry):
         """
-        Stores the initial mouse position when a drag starts.
+        Keeps the geometry a drag or resize ended at, and has the app
+        remember it for the next start.
         """
-        # Bind to the entire window for dragging
-        self._drag_start_x = event.x_root - self.winfo_x()
-        self._drag_start_y = event.y_root - self.winfo_y()
+        if self.is_hidden:
+            x, y = geometry.split("+", 1)[1].split("+")
+            self.hidden_geometry = f"200x50+{x}+{y}"
+        else:
+            self.normal_geometry = geometry
+            self.app.remember_geometry(self)
+
+class CounterWindow(CounterView, ctk.CTkToplevel):
+    """
+    An extra countdown window with its own deadline, position and compact
+    state, ticked and rendered with the resources of the main window.
+    Its date lives only as long as the window; it is not saved.
+    """
+    def __init__(self, app, deadline_id, doom_date, name=None, geometry="500x300+130+130", schedule=None):
+        super().__init__(app)
+        self.doom_date = doom_date
+        self.doom_date_str = doom_date.strftime(DATE_FORMAT)
+        self.doom_schedule = schedule
+        self.doom_deadline = Deadline(deadline_id, name or "DOOM", doom_date)
+        self.build_counter(app, name, geometry)
+        self.update_display(animate=False)
     
-    def on_drag(self, event):
+    def destroy(self):
+        self.mover.stop()
+        self.app.close_window(self)
+        super().destroy()
+
+class DoomCounter(CounterView, ctk.CTk):
+    """
+    Main application class for the Doom Counter.
+    Displays a countdown to a specified date and time, and owns everything
+    its extra CounterWindows share: one tick loop, alarms, the sprite cache
+    and the animation driver.
+    """
+    def __init__(self, render_mode="widgets", compact_interval=1, engine=None, page_size=10,
+                 alarms=(), alarm_sound=False, notify_command=None, metrics_file=None,
+                 metrics_interval=60, socket_path=None, date_file=None, watch_date_file=True,
+                 serve_address=None, windows=(), history_file=None, keep_history=True,
+                 window_state_file=None):
+        super().__init__()
+        
+        # Append-only log of deadline changes; written on its own thread, see history.py
+        self.history = EventLog(history_file or history_path()) if keep_history else None
+        
+        # Absolute path of the file holding the doom date
+        self.date_file = os.path.abspath(date_file) if date_file else default_path()
+        self.date_watcher = None
+        
+        # Work handed over from other threads (control socket) runs through here
+        self.tk_calls = TkCallQueue(self)
+        # Control socket for a single-instance counter, see ipc.py; started once the counter exists
+        self.control_server = None
+        
+        # Periodic metrics snapshot file (.prom for Prometheus text, else JSON)
+        self.metrics_file = metrics_file
+        self.metrics_interval = metrics_interval
+        self.metrics_overlay = None
+        self._metrics_job = None
+        
+        # Optional CountdownEngine with further deadlines, shown in a paged list
+        self.engine = engine
+        self.page_size = page_size
+        self.deadline_list = None
+        
+        # Alarm thresholds (seconds before a deadline) and how they are announced
+        self.alarm_offsets = tuple(alarms)
+        self.alarm_sound = alarm_sound
+        self.notify_command = notify_command
+        self.alarm_schedule = AlarmSchedule()
+        
+        self.render_mode = render_mode
+        # Seconds between updates of the compact bar; 60 or more hides seconds
+        self.compact_interval = compact_interval
+        # One frame cache shared by all cards in sprite mode
+        self.sprite_cache = FlipSpriteCache() if render_mode in ("sprites", "canvas") else None
+        # One animation clock drives every card's flip
+        self.animation_driver = AnimationDriver(self)
+        
+        # Every counter view, this window first; extra windows count their deadline ids down from -1
+        self.windows = [self]
+        self._window_ids = itertools.count(-1, -1)
+        
+        # Set theme and colors
+        ctk.set_appearance_mode("dark")
+        ctk.set_default_color_theme("dark-blue")
+        
+        # Monitor edges for snapping and for checking saved positions, listed in the background
+        self.monitors = MonitorAreas(self)
+        self.monitors.get()
+        
+        # Window positions from the previous run
+        self.window_state_file = os.path.abspath(window_state_file) if window_state_file else window_state_path()
+        self.window_state = read_window_state(self.window_state_file)
+        
+        # Load or set doom date, and the rule it recurs by if any
+        self.doom_date_str = "2025-06-01 00:00:00" # Default doom date
+        self.doom_schedule = None
+        self.load_or_set_doom_date()
+        
+        self.build_counter(self, geometry=self.saved_geometry("main") or "500x300+100+100")
+        
+        # Widget configure calls made in the last tick, over all windows (steady state should be near zero)
+        self.tick_configure_calls = 0
+        self._configure_calls_mark = 0
+        
+        # Alarms for the doom date (deadline id 0) and every listed deadline
+        self.alarm_clock = AlarmClock(self, self.alarm_schedule, self.on_alarm)
+        self.doom_deadline = Deadline(0, "DOOM", self.doom_date)
+        now = time.time()
+        for offset in self.alarm_offsets:
+            self.alarm_schedule.add(self.doom_deadline, offset, now=now)
+            if self.engine is not None:
+                for deadline in self.engine.next_n(len(self.engine)):
+                    self.alarm_schedule.add(deadline, offset, now=now)
+        if self.history is not None:
+            # Silent alarms at the due times log each deadline as it is reached
+            self.alarm_schedule.add(self.doom_deadline, 0, action=self.on_deadline_reached, now=now)
+            if self.engine is not None:
+                for deadline in self.engine.next_n(len(self.engine)):
+                    self.alarm_schedule.add(deadline, 0, action=self.on_deadline_reached, now=now)
+        self.alarm_clock.reschedule()
+        
+        # Start the countdown update loop
+        self.ticker = SecondTicker(self, self.update_countdown)
+        self.ticker.start()
+        
+        # Extra countdown windows, (doom date, name) each
+        for doom_date, name in windows:
+            self.open_window(doom_date, name)
+        
+        # Only now can commands such as "remaining" or "open" be answered
+        if socket_path:
+            server = ControlServer(socket_path, self.handle_command)
+            if server.start():
+                self.control_server = server
+            else:
+                print(f"Control socket unavailable: {server.error}")
+        
+        if self.metrics_file:
+            self._metrics_job = self.after(self.metrics_interval * 1000, self.write_metrics)
+        
+        # Optional HTTP overlay server; it only reads doom_date, never Tk
+        self.overlay_server = None
+        if serve_address is not None:
+            from overlay import OverlayServer
+            try:
+                self.overlay_server = OverlayServer(serve_address, lambda: self.doom_date)
+                self.overlay_server.start()
+                print(f"Serving the countdown on {self.overlay_server.url}")
+            except OSError as e:
+                print(f"Overlay server unavailable: {e}")
+        
+        # Follow edits of the date file; parsing happens on the watcher thread
+        if watch_date_file:
+            self.date_watcher = FileWatcher(
+                self.date_file,
+                lambda doom_date, schedule: self.tk_calls.call(self.on_date_file_changed, doom_date, schedule)
+            )
+            try:
+                self.date_watcher.start()
+            except OSError as e:
+                print(f"Not watching {self.date_file}: {e}")
+                self.date_watcher = None
+    
+    def load_or_set_doom_date(self):
+        """
+        Loads the doom date from a file or sets a default if not found/invalid.
+        """
+        if os.path.exists(self.date_file) or os.path.exists(LEGACY_PATH):
+            doom_date, self.doom_schedule = load_doom_entry(self.date_file)
+            if doom_date is None:
+                print(f"Invalid doom date in {self.date_file}, using a week from now")
+        else:
+            doom_date = datetime.strptime(self.doom_date_str, DATE_FORMAT)
+        if doom_date is not None:
+            self.doom_date = doom_date
+            self.doom_date_str = doom_date.strftime(DATE_FORMAT)
+        else:
+            # Default to 7 days from now if invalid
+            self.doom_date = datetime.now() + timedelta(days=7)
+            self.doom_date_str = self.doom_date.strftime(DATE_FORMAT)
+    
+    def save_doom_date(self):
+        """
+        Saves the current doom date, or the rule it came from, to the date
+        file, atomically.
+        """
+        text = self.doom_schedule.text if self.doom_schedule is not None else self.doom_date_str
+        try:
+            atomic_write(self.date_file, text)
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not save the doom date to {self.date_file}:\n{e}")
+    
+    def on_date_file_changed(self, doom_date, schedule):
+        """
+        Takes over a doom date written to the date file by another program.
+        Runs on the Tk thread; invalid or unchanged contents are ignored.
+        """
+        if doom_date is None:
+            return
+        rule = schedule.text if schedule is not None else None
+        if doom_date == self.doom_date and rule == (self.doom_schedule.text if self.doom_schedule else None):
+            return
+        self.apply_doom_date(doom_date, save=False, schedule=schedule, reason="file")
+    
+    def show_deadline_list(self):
+        """
+        Opens the paged list of upcoming deadlines, or focuses it if already open.
+        """
+        if self.deadline_list is not None and self.deadline_list.winfo_exists():
+            self.deadline_list.lift()
+            return
+        self.deadline_list = DeadlineListWindow(
+            self,
+            self.engine,
+            page_size=self.page_size,
+            text_color=self.text_color,
+            accent_color=self.fg_color,
+            button_bg=self.button_bg,
+            hover_color=self.accent_color,
+            bg_color=self.bg_color
+        )
+    
+    def open_window(self, doom_date=None, name=None, show_picker=False):
         """
-        Moves the window as the mouse is dragged.
+        Opens another countdown window, by default for a week from now and
+        cascaded from the last one. Returns the new CounterWindow.
         """
-        if hasattr(self, '_drag_start_x') and hasattr(self, '_drag_start_y'):
-            x = event.x_root - self._drag_start_x
-            y = event.y_root - self._drag_start_y
-            self.geometry(f"+{x}+{y}")
-            # Update hidden position if we're in hidden state to maintain relative position
+        if doom_date is None:
+            doom_date = (datetime.now() + timedelta(days=7)).replace(microsecond=0)
+        # Where a window of that name was last, else cascaded from the last window
+        geometry = self.saved_geometry(f"window:{name}") if name else None
+        if geometry is None:
+            last = self.windows[-1]
+            if last.winfo_ismapped():
+                x, y = last.winfo_x(), last.winfo_y()
+            else:
+                x, y = (int(part) for part in last.normal_geometry.split("+")[1:3])
+            geometry = f"500x300+{x + 30}+{y + 30}"
+        window = CounterWindow(self, next(self._window_ids), doom_date, name, geometry)
+        self.windows.append(window)
+        now = time.time()
+        for offset in self.alarm_offsets:
+            self.alarm_schedule.add(window.doom_deadline, offset, now=now)
+        if self.history is not None:
+            self.alarm_schedule.add(window.doom_deadline, 0, action=self.on_deadline_reached, now=now)
+            self.record("opened", window)
+        self.alarm_clock.reschedule()
+        self.update_tick_rate()
+        if show_picker:
+            window.show_date_picker()
+        return window
+    
+    def close_window(self, window):
+        """Forgets an extra window that is being destroyed, with its alarms."""
+        if window in self.windows:
+            self.windows.remove(window)
+            self.record("closed", window)
+            self.alarm_schedule.remove_deadline(window.doom_deadline.id)
+            self.alarm_clock.reschedule()
+            self.update_tick_rate()
+    
+    def state_key(self, view):
+        """Key of a view's position in the window state file; None if it is not kept."""
+        if view is self:
+            return "main"
+        return f"window:{view.name}" if view.name else None
+    
+    def saved_geometry(self, key):
+        """
+        The geometry string saved under `key`, or None if there is none or
+        it would put the window off every monitor (e.g. one that has been
+        unplugged since).
+        """
+        saved = self.window_state.get(key)
+        if saved is None:
+            return None
+        x, y, width, height = saved
+        center_x, center_y = x + width // 2, y + height // 2
+        for left, top, right, bottom in self.monitors.get():
+            if left <= center_x < right and top <= center_y < bottom:
+                return f"{width}x{height}+{x}+{y}"
+        return None
+    
+    def remember_geometry(self, view):
+        """Saves where a view is, for the next start."""
+        key = self.state_key(view)
+        match = re.match(r"(\d+)x(\d+)\+(-?\d+)\+(-?\d+)", view.normal_geometry)
+        if key is None or match is None:
+            return
+        width, height, x, y = (int(n) for n in match.groups())
+        self.window_state[key] = (x, y, width, height)
+        try:
+            save_window_state(self.window_state_file, self.window_state)
+        except OSError as e:
+            print(f"Could not save window positions: {e}")
+    
+    def deadline_moved(self, view, previous=None, reason="set"):
+        """
+        Re-arms the alarms of a view whose doom date changed, realigns the
+        compact ticks to it and logs the move from `previous`.
+        """
+        view.doom_deadline = Deadline(view.doom_deadline.id, view.doom_deadline.name, view.doom_date)
+        self.alarm_schedule.reschedule_deadline(view.doom_deadline, time.time())
+        self.alarm_clock.reschedule()
+        self.update_tick_rate()
+        if previous is not None and previous != view.doom_date:
+            self.record("rolled_over" if reason == "rollover" else "changed", view, previous, reason)
+    
+    def history_key(self, view):
+        """
+        Name of a view's deadline in the event log; None for unnamed extra
+        windows, which have nothing that identifies them across runs.
+        """
+        return self.state_key(view)
+    
+    def record(self, kind, view, previous=None, detail=None):
+        """Logs an event about a view's doom date; only queues it, see EventLog."""
+        key = self.history_key(view)
+        if self.history is None or key is None:
+            return
+        rule = view.doom_schedule.text if view.doom_schedule is not None else None
+        self.history.log(kind, key, view.doom_date.timestamp(),
+                         previous.timestamp() if previous is not None else None,
+                         ": ".join(part for part in (detail, rule) if part) or None)
+    
+    def on_deadline_reached(self, alarm):
+        """Action of the silent due-time alarms: logs the deadline as reached."""
+        view = next((view for view in self.windows if view.doom_deadline.id == alarm.deadline.id), None)
+        if view is not None:
+            self.record("reached", view)
+        else:
+            self.history.log("reached", f"deadline:{alarm.deadline.name}", alarm.deadline.timestamp)
+    
+    def update_tick_rate(self):
+        """
+        Matches the shared tick to the windows on screen.
+        
+        Any full view needs a tick every second. If all visible windows are
+        compact bars, ticks come every compact_interval seconds, aligned to
+        the doom dates so each tick lands when the shown values change;
+        that only works while the dates share a phase, else it stays at one
+        second. With nothing mapped the ticker stops.
+        """
+        visible = [window for window in self.windows if window.is_mapped]
+        if not visible:
+            self.ticker.stop()
+            return
+        interval, phase = 1, 0.0
+        if all(window.is_hidden for window in visible):
+            phases = {window.doom_date.timestamp() % self.compact_interval for window in visible}
+            if len(phases) == 1:
+                interval, phase = self.compact_interval, phases.pop()
+        self.ticker.set_interval(interval, phase)
+        if not self.ticker.running:
+            self.ticker.start(resync=True)
+
+    def handle_command(self, command, argument):
+        """
+        Answers a control socket command. Runs on the server thread, so
+        read-only queries are answered directly and everything that touches
+        widgets is handed to the Tk thread.
+        """
+        if command == "ping":
+            return "ok pong"
+        if command == "remaining":
+            remaining = remaining_seconds(self.doom_date)
+            return f"ok {max(0, int(remaining))} {format_remaining(remaining)}"
+        if command == "date":
+            return f"ok {self.doom_date_str}"
+        return self.tk_calls.call(self.run_command, command, argument)
+    
+    def run_command(self, command, argument):
+        """
+        Carries out a control socket command on the Tk thread.
+        """
+        if command == "set-date":
+            try:
+                new_date, schedule = parse_doom_date(argument)
+            except ValueError as e:
+                return f"error {e}"
+            self.apply_doom_date(new_date, schedule=schedule, reason="socket")
+            return f"ok {self.doom_date_str}"
+        if command == "open":
+            try:
+                doom_date, name = parse_deadline(argument)
+            except ValueError:
+                return "error invalid date, use YYYY-MM-DD HH:MM:SS [name]"
+            self.open_window(doom_date, name)
+            return f"ok {len(self.windows)} windows"
+        if command == "show":
+            self.deiconify()
             if self.is_hidden:
-                self.hidden_geometry = f"200x50+{x}+{y}"
+                self.toggle_hide_show()
+            self.lift()
+        elif command == "hide":
+            self.withdraw()
+        elif command == "compact":
+            self.deiconify()
+            if not self.is_hidden:
+                self.toggle_hide_show()
+        elif command == "quit":
+            self.after_idle(self.destroy)
+        return "ok"
+    
+    def on_alarm(self, alarm):
+        """
+        Announces an alarm that has no action of its own: a bell if
+        alarm_sound is set, and the notify command if one was given.
+        """
+        title = "DOOMSDAY!" if alarm.offset == 0 else f"{alarm.label}: {alarm.deadline.name}"
+        message = f"{alarm.deadline.name} {alarm.deadline.when.strftime('%Y-%m-%d %H:%M:%S')}"
+        if self.alarm_sound:
+            self.bell()
+        if self.notify_command:
+            run_notify_command(self.notify_command, title, message)
+    
+    def toggle_metrics_overlay(self, event=None):
+        """Opens the live metrics overlay, or closes it if it is open."""
+        if self.metrics_overlay is not None and self.metrics_overlay.winfo_exists():
+            self.metrics_overlay.destroy()
+            self.metrics_overlay = None
+        else:
+            self.metrics_overlay = MetricsOverlay(self, METRICS, text_color=self.text_color,
+                                                  bg_color=self.bg_color)
+    
+    def write_metrics(self):
+        """
+        Writes the metrics snapshot file and schedules the next write.
+        """
+        try:
+            METRICS.write(self.metrics_file)
+        except OSError as e:
+            print(f"Error writing metrics: {e}")
+        self._metrics_job = self.after(self.metrics_interval * 1000, self.write_metrics)
+    
+    def update_countdown(self, resync=False):
+        """
+        Tick callback of the SecondTicker, run once per wall-clock second
+        (or per compact_interval while every window is minimized). Updates
+        every visible window against the same current time.
+        After a late tick or a clock jump the cards snap to the current state.
+        """
+        # Widget updates since the previous tick, animation frames included
+        total = sum(window.card_configure_calls for window in self.windows)
+        self.tick_configure_calls = total - self._configure_calls_mark
+        self._configure_calls_mark = total
+        METRICS.observe("configure_calls_per_tick", self.tick_configure_calls, COUNT_BUCKETS)
+        
+        now = datetime.fromtimestamp(time.time()) # One clock read for every window
+        for window in self.windows:
+            if window.is_mapped:
+                window.update_display(animate=not resync, now=now)
+
+    def destroy(self):
+        for window in self.windows[1:]:
+            window.destroy()
+        self.mover.stop()
+        if self._metrics_job is not None:
+            self.after_cancel(self._metrics_job)
+            self._metrics_job = None
+            try:
+                METRICS.write(self.metrics_file) # Final snapshot on exit
+            except OSError as e:
+                print(f"Error writing metrics: {e}")
+        if self.control_server is not None:
+            self.control_server.stop()
+            self.control_server = None
+        if self.overlay_server is not None:
+            self.overlay_server.stop()
+            self.overlay_server = None
+        if self.date_watcher is not None:
+            self.date_watcher.stop()
+            self.date_watcher = None
+        self.tk_calls.close()
+        self.ticker.stop()
+        self.alarm_clock.stop()
+        self.animation_driver.stop()
+        if self.history is not None:
+            self.history.close() # Commits whatever is still queued
+            self.history = None
+        super().destroy()
+    
+
+def positive_int(text):
+    """argparse type for counts and intervals that must be at least 1."""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {text!r}") from None
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1: {value}")
+    return value
+
+def serve_address(text):
+    """argparse type of --serve; overlay.py is only imported when it is used."""
+    from overlay import parse_address
+    return parse_address(text)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Always-on-top doomsday countdown")
+    parser.add_argument(
+        "--render",
+        choices=["widgets", "sprites", "canvas"],
+        default="widgets",
+        help="flip card renderer: CTkLabel widgets, pre-rendered sprite frames, "
+             "or everything drawn on a single canvas"
+    )
+    parser.add_argument(
+        "--compact-interval",
+        type=positive_int,
+        default=1,
+        metavar="SECONDS",
+        help="update rate of the minimized bar; 60 or more updates once a minute and hides seconds"
+    )
+    parser.add_argument(
+        "--deadlines",
+        metavar="FILE",
+        help="extra deadlines to list, one 'YYYY-MM-DD HH:MM:SS name' per line"
+    )
+    parser.add_argument(
+        "--page-size",
+        type=positive_int,
+        default=10,
+        metavar="N",
+        help="deadlines shown per page of the list"
+    )
+    parser.add_argument(
+        "--alarm",
+        action="append",
+        type=parse_offset,
+        default=[],
+        metavar="THRESHOLD",
+        help="alert at a threshold before each deadline, e.g. T-24h, T-1h, 0 (repeatable)"
+    )
+    parser.add_argument(
+        "--alarm-sound",
+        action="store_true",
+        help="ring the bell when an alarm goes off"
+    )
+    parser.add_argument(
+        "--notify-command",
+        metavar="CMD",
+        help="command run when an alarm goes off, with {title} and {message} filled in, "
+             "e.g. \"notify-send {title} {message}\""
+    )
+    parser.add_argument(
+        "--metrics-file",
+        metavar="FILE",
+        help="periodically write runtime metrics to FILE, as Prometheus text if it ends in .prom, else JSON"
+    )
+    parser.add_argument(
+        "--metrics-interval",
+        type=positive_int,
+        default=60,
+        metavar="SECONDS",
+        help="seconds between metrics file writes"
+    )
+    parser.add_argument(
+        "--set-date",
+        metavar="'YYYY-MM-DD HH:MM:SS [ZONE]' | RULE",
+        help="set the doom date, optionally in an IANA time zone, or a recurrence rule such as "
+             "'every friday 17:00 Europe/Berlin'; forwarded to the running counter if there is one"
+    )
+    parser.add_argument(
+        "--window",
+        action="append",
+        default=[],
+        metavar="'YYYY-MM-DD HH:MM:SS [name]'",
+        help="open another countdown window in the same process (repeatable); "
+             "forwarded to the running counter if there is one"
+    )
+    parser.add_argument(
+        "--remaining",
+        action="store_true",
+        help="print the time left on the running counter (or in the date file) and exit"
+    )
+    parser.add_argument(
+        "--show",
+        action="store_true",
+        help="show and raise the running counter"
+    )
+    parser.add_argument(
+        "--hide",
+        action="store_true",
+        help="hide the running counter"
+    )
+    parser.add_argument(
+        "--date-file",
+        metavar="PATH",
+        help="file holding the doom date, watched for external edits "
+             "(default: $DOOMCOUNTER_DATE_FILE or doom_date.txt in the user config directory)"
+    )
+    parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        help="control socket of the single running instance (default: per-user runtime dir)"
+    )
+    parser.add_argument(
+        "--no-single-instance",
+        action="store_true",
+        help="always start a new counter and do not listen on the control socket"
+    )
+    parser.add_argument(
+        "--serve",
+        type=serve_address,
+        metavar="[HOST:]PORT",
+        help="also serve the countdown over HTTP as PNG/SVG snapshots, server-sent events "
+             "and an MJPEG stream (see overlay.py)"
+    )
+    parser.add_argument(
+        "--no-history",
+        action="store_true",
+        help="do not keep the event log of deadline changes"
+    )
+    parser.add_argument(
+        "--history",
+        action="store_true",
+        help="query the event log and exit; the other options are those of history.py"
+    )
+    parser.add_argument(
+        "--tui",
+        action="store_true",
+        help="count down in the terminal instead of opening a window; "
+             "the other options are those of tui.py"
+    )
+    parser.add_argument(
+        "--tray",
+        action="store_true",
+        help="show the countdown only as a tray icon, without a window; "
+             "the other options are those of tray.py"
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="print how long imports, window setup and the first frame took, then exit"
+    )
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
-    app = DoomCounter()
-    app.mainloop()
+    profile = StartupProfile()
+    # The other modes parse the rest of the command line themselves
+    argv = sys.argv[1:]
+    if "--tui" in argv:
+        import tui
+        tui.main([arg for arg in argv if arg != "--tui"])
+        sys.exit()
+    if "--tray" in argv:
+        import tray
+        tray.main([arg for arg in argv if arg != "--tray"])
+        sys.exit()
+    if "--history" in argv:
+        import history
+        history.main([arg for arg in argv if arg != "--history"])
+        sys.exit()
+    args = parse_args()
+    
+    if args.set_date:
+        try:
+            parse_doom_date(args.set_date)
+        except ValueError as e:
+            sys.exit(f"Invalid doom date, use YYYY-MM-DD HH:MM:SS [time zone] or a rule: {e}")
+    windows = []
+    for spec in args.window:
+        try:
+            windows.append(parse_deadline(spec))
+        except ValueError:
+            sys.exit(f"Invalid date/time format, use YYYY-MM-DD HH:MM:SS [name]: {spec}")
+    
+    socket_path = None
+    if not (args.no_single_instance or args.profile_startup) and hasattr(socket, "AF_UNIX"):
+        socket_path = args.socket or default_socket_path()
+        # Hand the request to the running instance instead of starting another one
+        commands = []
+        if args.set_date:
+            commands.append(f"set-date {args.set_date}")
+        commands.extend(f"open {spec.strip()}" for spec in args.window)
+        if args.hide:
+            commands.append("hide")
+        elif args.show or not (args.set_date or args.window or args.remaining):
+            commands.append("show")
+        if args.remaining:
+            commands.append("remaining")
+        try:
+            for command in commands:
+                reply = send_command(socket_path, command)
+                if command == "remaining" or reply.startswith("error"):
+                    print(reply)
+            sys.exit()
+        except OSError:
+            pass # No instance running, this process becomes it
+    
+    if args.remaining:
+        doom_date = load_doom_date(os.path.abspath(args.date_file) if args.date_file else default_path())
+        if doom_date is None:
+            sys.exit("No doom date set")
+        remaining = remaining_seconds(doom_date)
+        print(f"ok {max(0, int(remaining))} {format_remaining(remaining)}")
+        sys.exit()
+    
+    engine = load_deadlines(args.deadlines) if args.deadlines else None
+    profile.mark("arguments and deadlines")
+    app = DoomCounter(
+        render_mode=args.render,
+        compact_interval=args.compact_interval,
+        engine=engine,
+        page_size=args.page_size,
+        alarms=args.alarm,
+        alarm_sound=args.alarm_sound,
+        notify_command=args.notify_command,
+        metrics_file=args.metrics_file,
+        metrics_interval=args.metrics_interval,
+        socket_path=socket_path,
+        date_file=args.date_file,
+        serve_address=args.serve,
+        windows=windows,
+        keep_history=not args.no_history
+    )
+    if args.set_date:
+        new_date, schedule = parse_doom_date(args.set_date)
+        app.apply_doom_date(new_date, schedule=schedule, reason="command line")
+    if args.hide:
+        app.withdraw()
+    if args.profile_startup:
+        profile.mark("build window")
+        app.update() # Map and draw the first frame
+        profile.mark("first frame")
+        print(profile.report(), file=sys.stderr)
+        app.destroy()
+    else:
+        app.mainloop()
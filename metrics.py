@@ -0,0 +1,160 @@
+"""
+In-memory runtime metrics for the Doom Counter: histograms, counters and
+gauges that the UI records into and that can be written out as JSON or
+Prometheus text. Recording is a few arithmetic operations, so it stays on
+in normal use.
+"""
+import bisect
+import json
+import os
+import sys
+import time
+
+# Upper bounds for durations in seconds (tick lateness, frame times)
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.02, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+# Upper bounds for small counts (widget configure calls per tick)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+class Histogram:
+    """
+    Per-bucket counts plus count, sum and max; exported cumulatively like a
+    Prometheus histogram.
+    """
+    __slots__ = ("bounds", "buckets", "count", "sum", "max")
+
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.buckets = [0] * (len(self.bounds) + 1) # Last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        """
+        Estimates a quantile as the upper bound of the bucket it falls in
+        (the observed max for the +Inf bucket).
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return self.bounds[index] if index < len(self.bounds) else self.max
+        return self.max
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": dict(zip([*map(str, self.bounds), "+Inf"], self.buckets)),
+        }
+
+
+def read_rss():
+    """
+    Resident set size of this process in bytes, or None where it cannot be
+    read without extra dependencies.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current RSS; kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Metrics:
+    """
+    A registry of named histograms, counters and gauges.
+    """
+    def __init__(self):
+        self.histograms = {}
+        self.counters = {}
+        self.gauges = {}
+        self.started = time.time()
+
+    def histogram(self, name, bounds=DURATION_BUCKETS):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram(bounds)
+        return histogram
+
+    def observe(self, name, value, bounds=DURATION_BUCKETS):
+        self.histogram(name, bounds).observe(value)
+
+    def inc(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set(self, name, value):
+        self.gauges[name] = value
+
+    def sample_process(self):
+        """Refreshes the process gauges (RSS, CPU time)."""
+        rss = read_rss()
+        if rss is not None:
+            self.set("process_resident_memory_bytes", rss)
+        self.set("process_cpu_seconds_total", time.process_time())
+        self.set("process_uptime_seconds", time.time() - self.started)
+
+    def to_dict(self):
+        return {
+            "timestamp": time.time(),
+            "counters": dict(self.counters),
+            "gauges": dict(self.gauges),
+            "histograms": {name: h.to_dict() for name, h in self.histograms.items()},
+        }
+
+    def to_prometheus(self, prefix="doomcounter_"):
+        lines = []
+        for name, value in sorted(self.counters.items()):
+            lines += [f"# TYPE {prefix}{name} counter", f"{prefix}{name} {value}"]
+        for name, value in sorted(self.gauges.items()):
+            lines += [f"# TYPE {prefix}{name} gauge", f"{prefix}{name} {value}"]
+        for name, histogram in sorted(self.histograms.items()):
+            lines.append(f"# TYPE {prefix}{name} histogram")
+            cumulative = 0
+            for bound, n in zip([*map(str, histogram.bounds), "+Inf"], histogram.buckets):
+                cumulative += n
+                lines.append(f'{prefix}{name}_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f"{prefix}{name}_sum {histogram.sum}")
+            lines.append(f"{prefix}{name}_count {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """
+        Writes a snapshot to `path`, as Prometheus text for a .prom file and
+        JSON otherwise. The file is replaced atomically so scrapers never
+        see a partial snapshot.
+        """
+        self.sample_process()
+        if path.endswith(".prom"):
+            data = self.to_prometheus()
+        else:
+            data = json.dumps(self.to_dict(), indent=2)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+# Process-wide registry the UI records into
+METRICS = Metrics()
@@ -0,0 +1,324 @@
+"""
+Local HTTP server that serves the countdown to streaming overlays and
+dashboards, in the window's colours:
+
+    /                 a small HTML page showing the live stream
+    /countdown.png    PNG snapshot          /countdown.svg   SVG snapshot
+    /countdown.json   remaining time as JSON
+    /events           server-sent events, one JSON message per second
+    /stream.mjpg      MJPEG stream, one frame per second
+
+Each distinct second is rendered at most once per format and cached with an
+ETag, and all streaming clients wait on the same per-second clock, so many
+clients cost about as much as one. The server runs on its own threads and
+never touches Tk.
+"""
+import argparse
+import io
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from countdown import DATE_FORMAT, countdown_values, format_remaining, remaining_seconds
+from datefile import default_path, load_doom_entry
+from recurrence import current_doom_date
+from render import render_countdown, render_countdown_svg
+
+INDEX_HTML = """<!doctype html>
+<html><head><title>Doom Counter</title></head>
+<body style="margin:0;background:transparent">
+<img src="/stream.mjpg" alt="countdown">
+</body></html>
+"""
+
+
+class SecondClock:
+    """
+    One thread that wakes at every wall-clock second boundary and wakes all
+    waiting stream clients at once.
+    """
+    def __init__(self):
+        self.second = int(time.time())
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="doomcounter-overlay-clock", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stopped:
+            time.sleep(1 - time.time() % 1 + 0.005)
+            with self._condition:
+                self.second = int(time.time())
+                self._condition.notify_all()
+
+    def wait_next(self, last_second):
+        """
+        Blocks until the second differs from `last_second` and returns it,
+        or returns None once the clock is stopped.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self.second != last_second or self._stopped)
+            return None if self._stopped else self.second
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+
+class FrameCache:
+    """
+    Rendered countdown frames keyed by format, for the last `keep` seconds,
+    so clients a second apart do not evict each other's frames. A frame is
+    rendered by the first request that needs it, outside the cache lock;
+    concurrent requests for the same frame wait for that render instead of
+    repeating it, while other frames are served meanwhile.
+    """
+    CONTENT_TYPES = {
+        "png": "image/png",
+        "jpeg": "image/jpeg",
+        "svg": "image/svg+xml",
+        "json": "application/json",
+    }
+
+    def __init__(self, get_doom_date, scale=1.0, keep=2):
+        self.get_doom_date = get_doom_date
+        self.scale = scale
+        self.keep = keep
+        self.renders = 0
+        self._lock = threading.Lock()
+        # (doom date, second) -> {format: Future of (body, ETag)}, oldest first
+        self._seconds = OrderedDict()
+
+    def get(self, fmt, second=None):
+        """
+        Returns (body bytes, ETag) of the frame for `second` (default: now).
+        """
+        second = int(time.time()) if second is None else second
+        doom_date = self.get_doom_date()
+        key = (doom_date, second)
+        with self._lock:
+            frames = self._seconds.get(key)
+            if frames is None:
+                frames = self._seconds[key] = {}
+                while len(self._seconds) > self.keep:
+                    self._seconds.popitem(last=False)
+            future = frames.get(fmt)
+            owner = future is None
+            if owner:
+                future = frames[fmt] = Future()
+                self.renders += 1
+        if owner:
+            try:
+                future.set_result((self._render(fmt, doom_date, second),
+                                   f'"{int(doom_date.timestamp())}-{second}-{fmt}"'))
+            except BaseException as e:
+                future.set_exception(e)
+                with self._lock:
+                    # Let the next request try again
+                    if self._seconds.get(key, {}).get(fmt) is future:
+                        del self._seconds[key][fmt]
+        return future.result()
+
+    def _render(self, fmt, doom_date, second):
+        remaining = remaining_seconds(doom_date, datetime.fromtimestamp(second))
+        values = countdown_values(remaining)
+        if fmt == "json":
+            return json.dumps({
+                "doom_date": doom_date.strftime(DATE_FORMAT),
+                "remaining_seconds": max(0, int(remaining)),
+                "text": format_remaining(remaining),
+                "values": values,
+            }).encode()
+        if fmt == "svg":
+            return render_countdown_svg(values, self.scale).encode()
+        image = render_countdown(values, self.scale)
+        buffer = io.BytesIO()
+        if fmt == "jpeg":
+            image.save(buffer, "JPEG", quality=85)
+        else:
+            image.save(buffer, "PNG", optimize=False)
+        return buffer.getvalue()
+
+
+class OverlayRequestHandler(BaseHTTPRequestHandler):
+    server_version = "DoomCounter"
+    protocol_version = "HTTP/1.1"
+
+    SNAPSHOTS = {"/countdown.png": "png", "/countdown.svg": "svg", "/countdown.json": "json"}
+
+    def log_message(self, format, *args):
+        pass # One request per second per client would flood stderr
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        try:
+            if path in self.SNAPSHOTS:
+                self._snapshot(self.SNAPSHOTS[path])
+            elif path == "/events":
+                self._events()
+            elif path == "/stream.mjpg":
+                self._mjpeg()
+            elif path == "/":
+                self._send(200, "text/html; charset=utf-8", INDEX_HTML.encode())
+            else:
+                self._send(404, "text/plain", b"not found\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _send(self, status, content_type, body, etag=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Access-Control-Allow-Origin", "*")
+        if etag is not None:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "max-age=1")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _snapshot(self, fmt):
+        body, etag = self.server.frames.get(fmt)
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self._send(200, FrameCache.CONTENT_TYPES[fmt], body, etag)
+
+    def _stream_headers(self, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+    def _streaming(self):
+        """Yields each new second until the server shuts down."""
+        clock = self.server.clock
+        second = None
+        while not self.server.stopping:
+            second = clock.wait_next(second)
+            if second is None:
+                return
+            yield second
+
+    def _events(self):
+        self._stream_headers("text/event-stream")
+        for second in self._streaming():
+            body, etag = self.server.frames.get("json", second)
+            self.wfile.write(b"id: " + etag.strip('"').encode() + b"\ndata: " + body + b"\n\n")
+            self.wfile.flush()
+
+    def _mjpeg(self):
+        self._stream_headers("multipart/x-mixed-replace; boundary=frame")
+        for second in self._streaming():
+            body, _ = self.server.frames.get("jpeg", second)
+            self.wfile.write(b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: "
+                             + str(len(body)).encode() + b"\r\n\r\n" + body + b"\r\n")
+            self.wfile.flush()
+
+
+class OverlayServer(ThreadingHTTPServer):
+    """
+    The HTTP server plus its clock and frame cache, run on a daemon thread
+    with start() and shut down with stop().
+    """
+    daemon_threads = True
+
+    def __init__(self, address, get_doom_date, scale=1.0):
+        super().__init__(address, OverlayRequestHandler)
+        self.frames = FrameCache(get_doom_date, scale)
+        self.clock = SecondClock()
+        self.stopping = False
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name="doomcounter-overlay", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.stopping = True
+        self.clock.stop()
+        self.shutdown()
+        self.server_close()
+
+
+def parse_address(text, default_host="127.0.0.1"):
+    """
+    Parses "PORT" or "HOST:PORT"; usable as an argparse type.
+    """
+    host, _, port = text.rpartition(":")
+    try:
+        port = int(port)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid address, use [HOST:]PORT: {text!r}") from None
+    if not 0 <= port <= 65535:
+        raise argparse.ArgumentTypeError(f"port out of range: {port}")
+    return (host or default_host, port)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the doomsday countdown over HTTP")
+    parser.add_argument(
+        "address",
+        nargs="?",
+        type=parse_address,
+        default="8765",
+        metavar="[HOST:]PORT",
+        help="where to listen (default: 127.0.0.1:8765)"
+    )
+    parser.add_argument(
+        "--date",
+        metavar="'YYYY-MM-DD HH:MM:SS'",
+        help="count down to this date instead of the one in the date file"
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="size of the rendered images relative to the window's cards"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    schedule = None
+    if args.date:
+        try:
+            doom_date = datetime.strptime(args.date, DATE_FORMAT)
+        except ValueError:
+            sys.exit(f"Invalid date/time format, use YYYY-MM-DD HH:MM:SS: {args.date}")
+    else:
+        doom_date, schedule = load_doom_entry(default_path())
+        if doom_date is None:
+            doom_date, schedule = datetime.now() + timedelta(days=7), None
+    # Worked out from the first occurrence each time, so a recurring date moves on by itself
+    server = OverlayServer(args.address, lambda: current_doom_date(doom_date, schedule), scale=args.scale)
+    print(f"Serving the countdown on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stopping = True
+        server.clock.stop()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""
+Recurring and time-zone-aware doom dates.
+
+Besides a plain local "YYYY-MM-DD HH:MM:SS", the doom date can be the same
+followed by an IANA zone ("2026-03-01 09:00:00 America/New_York") or a
+recurrence rule:
+
+    every friday 17:00 Europe/Berlin
+    every mon,wed,fri at 09:30
+    every 2 weeks on friday 17:00 from 2026-01-09 Europe/Berlin
+    every 3 days 08:00 from 2026-01-01
+    every month on last 23:59:59 UTC
+
+A Schedule never expands its series. next_after() works out the one
+occurrence that follows a moment by arithmetic on the calendar, so rolling
+over to the next deadline costs the same however long the rule has run.
+Zones are loaded once, and the UTC offset changes of a zone are found once
+per year and kept, so converting wall times needs only a bisect.
+"""
+import bisect
+import calendar
+import functools
+import re
+import time
+from datetime import date, datetime, timedelta
+
+from countdown import DATE_FORMAT
+
+EPOCH = datetime(1970, 1, 1)
+ROLLOVER_SECONDS = 60 # How long a reached recurring deadline shows DOOMSDAY before moving on
+
+WEEKDAYS = {name: index for index, names in enumerate((
+    ("mon", "monday"), ("tue", "tues", "tuesday"), ("wed", "wednesday"), ("thu", "thurs", "thursday"),
+    ("fri", "friday"), ("sat", "saturday"), ("sun", "sunday"),
+)) for name in names}
+
+RULE = re.compile(
+    r"every\s+(?:(?P<count>\d+)\s+)?"
+    r"(?P<unit>days?|weeks?|months?|[a-z]+(?:\s*,\s*[a-z]+)*)"
+    r"(?:\s+on\s+(?P<on>[a-z0-9]+(?:\s*,\s*[a-z0-9]+)*))?"
+    r"(?:\s+at)?\s+(?P<time>\d{1,2}:\d{2}(?::\d{2})?)"
+    r"(?:\s+from\s+(?P<start>\d{4}-\d{2}-\d{2}))?"
+    r"(?:\s+(?P<zone>[A-Za-z][\w+\-]*(?:/[\w+\-]+)*))?$",
+    re.IGNORECASE
+)
+
+
+@functools.lru_cache(maxsize=None)
+def get_zone(name):
+    """
+    The ZoneInfo for an IANA zone name, loaded once per name. Raises
+    ValueError for unknown names or where zoneinfo is unavailable.
+    """
+    try:
+        import zoneinfo
+    except ImportError:
+        raise ValueError("Time zones need Python 3.9 or newer") from None
+    try:
+        return zoneinfo.ZoneInfo(name)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown time zone: {name!r}") from None
+
+
+@functools.lru_cache(maxsize=256)
+def _transitions(zone, year):
+    """
+    The UTC offset changes of `zone` during a UTC calendar year, as sorted
+    lists of (timestamps, offsets in seconds), starting with the offset in
+    force at the start of the year.
+
+    Found by probing once a day and bisecting to the second where the
+    offset differs, so a zone costs ~400 lookups once per year. Zones that
+    change offset twice within one day are not supported.
+    """
+    def offset(ts):
+        return int(datetime.fromtimestamp(ts, zone).utcoffset().total_seconds())
+    end = calendar.timegm((year + 1, 1, 1, 0, 0, 0))
+    ts = calendar.timegm((year, 1, 1, 0, 0, 0))
+    stamps, offsets = [ts], [offset(ts)]
+    while ts < end:
+        probe = min(ts + 86400, end)
+        if offset(probe) == offsets[-1]:
+            ts = probe
+            continue
+        low, high = ts, probe
+        while high - low > 1:
+            middle = (low + high) // 2
+            if offset(middle) == offsets[-1]:
+                low = middle
+            else:
+                high = middle
+        stamps.append(high)
+        offsets.append(offset(high))
+        ts = high
+    return stamps, offsets
+
+
+def utc_offset(zone, ts):
+    """Offset of `zone` from UTC in seconds at timestamp `ts`."""
+    stamps, offsets = _transitions(zone, time.gmtime(ts).tm_year)
+    return offsets[bisect.bisect_right(stamps, ts) - 1]
+
+
+def wall_time(zone, ts):
+    """The naive wall-clock time in `zone` (None: the local zone) at `ts`."""
+    if zone is None:
+        return datetime.fromtimestamp(ts)
+    return EPOCH + timedelta(seconds=ts + utc_offset(zone, ts))
+
+
+def to_timestamp(zone, wall):
+    """
+    Timestamp of the naive wall-clock time `wall` in `zone` (None: the
+    local zone). Like zoneinfo with fold=0, an ambiguous time maps to its
+    first occurrence and a time skipped by a DST jump to the moment the
+    same distance past the jump.
+    """
+    if zone is None:
+        return wall.timestamp()
+    naive = (wall - EPOCH).total_seconds()
+    _, offsets = _transitions(zone, wall.year)
+    candidates = sorted(set(offsets), reverse=True)
+    for offset in candidates:
+        if utc_offset(zone, naive - offset) == offset:
+            return naive - offset
+    # Skipped wall time: use the offset in force just before the jump
+    return naive - utc_offset(zone, naive - candidates[0])
+
+
+def _parse_time(text):
+    parts = [int(part) for part in text.split(":")] + [0]
+    hour, minute, second = parts[:3]
+    if hour > 23 or minute > 59 or second > 59:
+        raise ValueError(f"Invalid time of day: {text!r}")
+    return hour, minute, second
+
+
+class Schedule:
+    """
+    The occurrences of a doom date rule, one at a time.
+
+    `kind` is "once" (a single zoned date), "days", "weeks" or "months";
+    `every` is the period in those units; `weekdays` (0 = Monday) or `day`
+    (day of month, -1 for the last) pick the days within a period.
+    """
+    def __init__(self, text, kind, at, zone=None, every=1, weekdays=(), day=None, start=None):
+        self.text = text
+        self.kind = kind
+        self.at = at # (hour, minute, second)
+        self.zone = zone
+        self.every = every
+        self.weekdays = tuple(sorted(weekdays))
+        self.day = day
+        self.start = start # First date occurrences may fall on
+
+    def __repr__(self):
+        return f"Schedule({self.text!r})"
+
+    def _wall(self, day):
+        return datetime(day.year, day.month, day.day, *self.at)
+
+    def _first_day(self, day):
+        """The first date on or after `day` the rule fires on."""
+        if self.start is not None and day < self.start:
+            day = self.start
+        if self.kind == "once":
+            return day if day == self.start else None
+        if self.kind == "days":
+            behind = (day - self.start).days % self.every
+            return day + timedelta(days=(self.every - behind) % self.every)
+        if self.kind == "weeks":
+            anchor = self.start - timedelta(days=self.start.weekday()) # Monday of the first week
+            week_start = day - timedelta(days=day.weekday())
+            weeks = (week_start - anchor).days // 7
+            if weeks % self.every == 0:
+                for weekday in self.weekdays:
+                    if weekday >= day.weekday():
+                        return week_start + timedelta(days=weekday)
+            weeks += self.every - weeks % self.every
+            return anchor + timedelta(weeks=weeks, days=self.weekdays[0])
+        # months
+        months = (day.year - self.start.year) * 12 + day.month - self.start.month
+        if months % self.every == 0:
+            candidate = self._month_day(self.start.year, self.start.month + months)
+            if candidate >= day:
+                return candidate
+        months += self.every - months % self.every
+        return self._month_day(self.start.year, self.start.month + months)
+
+    def _month_day(self, year, month):
+        year, month = year + (month - 1) // 12, (month - 1) % 12 + 1
+        length = calendar.monthrange(year, month)[1]
+        return date(year, month, length if self.day == -1 else min(self.day, length))
+
+    def next_after(self, ts):
+        """
+        The first occurrence strictly after timestamp `ts`, as a naive local
+        datetime like every other doom date, or None when there is none.
+        """
+        day = self._first_day(wall_time(self.zone, ts).date())
+        # At most one step: today's occurrence may already be past
+        for _ in range(2):
+            if day is None:
+                return None
+            occurrence = to_timestamp(self.zone, self._wall(day))
+            if occurrence > ts:
+                return datetime.fromtimestamp(occurrence)
+            day = self._first_day(day + timedelta(days=1))
+        return None
+
+    def occurrences(self, after=None):
+        """
+        Lazily yields the occurrences after timestamp `after` (default:
+        now), computing each only when it is asked for.
+        """
+        ts = time.time() if after is None else after
+        while True:
+            occurrence = self.next_after(ts)
+            if occurrence is None:
+                return
+            yield occurrence
+            ts = occurrence.timestamp()
+
+
+def parse_schedule(text):
+    """
+    Parses a zoned date or a recurrence rule into a Schedule. Raises
+    ValueError for anything else.
+    """
+    text = " ".join(text.split())
+    parts = text.split(" ")
+    if len(parts) == 3:
+        try:
+            wall = datetime.strptime(" ".join(parts[:2]), DATE_FORMAT)
+        except ValueError:
+            pass
+        else:
+            return Schedule(text, "once", (wall.hour, wall.minute, wall.second),
+                            zone=get_zone(parts[2]), start=wall.date())
+
+    match = RULE.match(text)
+    if match is None:
+        raise ValueError(f"Not a date or recurrence rule: {text!r}")
+    at = _parse_time(match["time"])
+    zone = get_zone(match["zone"]) if match["zone"] and match["zone"].lower() != "local" else None
+    start = datetime.strptime(match["start"], "%Y-%m-%d").date() if match["start"] else None
+    every = int(match["count"] or 1)
+    if every < 1:
+        raise ValueError(f"Invalid period: {text!r}")
+    if every > 1 and start is None:
+        # Otherwise which weeks count would depend on when the rule was read
+        raise ValueError(f"Periods longer than one need 'from YYYY-MM-DD': {text!r}")
+    unit = match["unit"].lower()
+    on = [part.strip() for part in match["on"].lower().split(",")] if match["on"] else []
+
+    def weekdays(names):
+        try:
+            return [WEEKDAYS[name] for name in names]
+        except KeyError as e:
+            raise ValueError(f"Unknown weekday {e.args[0]!r} in {text!r}") from None
+
+    if unit.rstrip("s") == "day":
+        if on:
+            raise ValueError(f"'on' does not apply to days: {text!r}")
+        return Schedule(text, "days", at, zone, every, start=start or EPOCH.date())
+    if unit.rstrip("s") == "month":
+        if len(on) != 1 or not (on[0] == "last" or on[0].isdigit() and 1 <= int(on[0]) <= 31):
+            raise ValueError(f"Monthly rules need 'on DAY' or 'on last': {text!r}")
+        return Schedule(text, "months", at, zone, every, day=-1 if on[0] == "last" else int(on[0]),
+                        start=start or EPOCH.date())
+    if unit.rstrip("s") == "week":
+        if not on and start is None:
+            raise ValueError(f"Weekly rules need 'on DAYS' or 'from YYYY-MM-DD': {text!r}")
+        days = weekdays(on) if on else [start.weekday()]
+    else:
+        if on or match["count"]:
+            raise ValueError(f"Use 'every N weeks on DAYS' for periods: {text!r}")
+        days = weekdays([name.strip() for name in unit.split(",")])
+    return Schedule(text, "weeks", at, zone, every, weekdays=set(days), start=start or EPOCH.date())
+
+
+def parse_doom_date(text, now=None):
+    """
+    Parses anything the date file and SET DATE accept into (next due date
+    as a naive local datetime, Schedule or None). A plain date has no
+    schedule and is returned even if it has passed; a schedule's date is
+    its next occurrence after timestamp `now` (default: now), or None once
+    it has no more. Raises ValueError for invalid text.
+    """
+    text = text.strip()
+    try:
+        return datetime.strptime(text, DATE_FORMAT), None
+    except ValueError:
+        pass
+    schedule = parse_schedule(text)
+    if schedule.kind == "once":
+        # A single date stays put once it has passed, like a plain one
+        return datetime.fromtimestamp(to_timestamp(schedule.zone, schedule._wall(schedule.start))), schedule
+    return schedule.next_after(time.time() if now is None else now), schedule
+
+
+def current_doom_date(doom_date, schedule, now=None):
+    """
+    The date to count down to at timestamp `now` (default: now): `doom_date`
+    until it has been reached for ROLLOVER_SECONDS, then the next occurrence
+    of a recurring `schedule`. Plain and one-off dates never move.
+    """
+    if schedule is None or schedule.kind == "once":
+        return doom_date
+    now = time.time() if now is None else now
+    if now - doom_date.timestamp() < ROLLOVER_SECONDS:
+        return doom_date
+    return schedule.next_after(now - ROLLOVER_SECONDS) or doom_date
@@ -0,0 +1,178 @@
+"""
+Pillow helpers and theme colours shared by every renderer that draws the
+countdown as an image (sprite cards, tray icon, ...). Nothing here imports
+Tk, and Pillow is imported inside the functions that use it. customtkinter
+already loads PIL.Image, so in the window only ImageDraw and ImageFont
+(~4-5 ms) are deferred, until a sprite or canvas card is first drawn.
+These are plain import statements on purpose: PyInstaller finds them and
+bundles the modules, which it cannot do for names computed at run time.
+"""
+from functools import lru_cache
+
+# The Doom Counter palette, used by the window and every image renderer
+THEME = {
+    "bg": "#1a1a1a",        # Background color
+    "fg": "#ff4d4d",        # Main accent color (red)
+    "accent": "#ff1a1a",    # Secondary accent color (darker red)
+    "text": "#ffffff",      # Text color
+    "button_bg": "#2b2b2b", # Button and card background
+}
+
+@lru_cache(maxsize=16)
+def load_pil_font(family, size, bold=False):
+    """
+    Resolves a Tk-style font description to a PIL font.
+    Falls back to a common monospace face and finally to PIL's built-in font.
+    """
+    from PIL import ImageFont
+    name = family.lower().replace(" ", "")
+    candidates = [f"{name}b.ttf", f"{name}bd.ttf"] if bold else []
+    candidates += [f"{name}.ttf", f"{family}.ttf"]
+    candidates.append("DejaVuSansMono-Bold.ttf" if bold else "DejaVuSansMono.ttf")
+    for candidate in candidates:
+        try:
+            return ImageFont.truetype(candidate, size)
+        except OSError:
+            continue
+    return ImageFont.load_default(size)
+
+
+def render_card_half(text, width, height, font, fg_color, text_color, corner_radius=5):
+    """
+    Draws one half of a card the way a CTkLabel of the same size would:
+    a rounded rectangle with the text centred and clipped to the box.
+    """
+    from PIL import Image, ImageDraw
+    image = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    radius = min(corner_radius, (height - 1) // 2)
+    draw.rounded_rectangle((0, 0, width - 1, height - 1), radius=radius, fill=fg_color)
+    draw.text((width / 2, height / 2), text, font=font, fill=text_color, anchor="mm")
+    return image
+
+
+@lru_cache(maxsize=64)
+def render_badge(text, size, fg_color=THEME["fg"], bg_color=THEME["bg"], font_family="Consolas"):
+    """
+    Draws `text` as large as it fits on a square rounded badge, e.g. a tray
+    icon. Memoised on text and size, so a badge shown before is never
+    redrawn; callers must not modify the returned image.
+    """
+    from PIL import Image, ImageDraw
+    image = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    draw.rounded_rectangle((0, 0, size - 1, size - 1), radius=size // 6, fill=bg_color)
+    # Largest font size whose text fits with a small margin
+    font_size = size
+    while font_size > 6:
+        font = load_pil_font(font_family, font_size, True)
+        left, top, right, bottom = draw.textbbox((0, 0), text, font=font)
+        if right - left <= size * 0.9 and bottom - top <= size * 0.8:
+            break
+        font_size -= 2
+    draw.text((size / 2, size / 2), text, font=font, fill=fg_color, anchor="mm")
+    return image
+
+
+# Card geometry of the window's flip cards, in pixels at scale 1
+CARD_WIDTH = 40
+CARD_HEIGHT = 100
+DIGIT_PAD = 1
+GROUP_PAD = 5
+CAPTION_PAD = 5
+CAPTION_HEIGHT = 28
+UNITS = ("DAYS", "HOURS", "MINUTES", "SECONDS")
+
+
+def countdown_layout(values, scale=1.0):
+    """
+    Positions the cards and captions for a set of card values the way the
+    window lays them out. Returns (width, height, cards, captions) with
+    cards as (x, digit) and captions as (centre x, unit).
+    """
+    card_width = round(CARD_WIDTH * scale)
+    digit_pad = round(DIGIT_PAD * scale)
+    group_pad = round(GROUP_PAD * scale)
+    cards, captions = [], []
+    x = 0
+    for value, unit in zip(values, UNITS):
+        x += group_pad
+        start = x
+        for digit in value:
+            x += digit_pad
+            cards.append((x, digit))
+            x += card_width + digit_pad
+        captions.append(((start + x) // 2, unit))
+        x += group_pad
+    height = round((CARD_HEIGHT + CAPTION_PAD + CAPTION_HEIGHT) * scale)
+    return x, height, cards, captions
+
+
+@lru_cache(maxsize=32)
+def render_digit_card(digit, scale=1.0):
+    """
+    One whole flip card (top and bottom half) showing `digit`, memoised so
+    a countdown frame is pasted together from at most ten renders.
+    """
+    from PIL import Image
+    width, height = round(CARD_WIDTH * scale), round(CARD_HEIGHT * scale)
+    half = height // 2
+    font = load_pil_font("Consolas", round(42 * scale), True)
+    card = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    # Each half shows its part of the digit, like the CTkLabel halves do
+    full_top = render_card_half(digit, width, height, font, THEME["button_bg"], THEME["fg"])
+    full_bottom = render_card_half(digit, width, height, font, "#333333", THEME["fg"])
+    card.paste(full_top.crop((0, 0, width, half)), (0, 0))
+    card.paste(full_bottom.crop((0, half, width, height)), (0, half))
+    return card
+
+
+def render_countdown(values, scale=1.0):
+    """
+    Draws the four flip-card groups with their captions as a PIL image in
+    the window's colours.
+    """
+    from PIL import Image, ImageDraw
+    width, height, cards, captions = countdown_layout(values, scale)
+    image = Image.new("RGB", (width, height), THEME["bg"])
+    for x, digit in cards:
+        card = render_digit_card(digit, scale)
+        image.paste(card, (x, 0), card)
+    draw = ImageDraw.Draw(image)
+    font = load_pil_font("Arial", round(10 * scale * 4 / 3), True)
+    caption_y = round((CARD_HEIGHT + CAPTION_PAD + CAPTION_HEIGHT / 2) * scale)
+    for x, unit in captions:
+        draw.text((x, caption_y), unit, font=font, fill=THEME["text"], anchor="mm")
+    return image
+
+
+def render_countdown_svg(values, scale=1.0):
+    """
+    The same picture as render_countdown as an SVG document; needs no Pillow.
+    """
+    width, height, cards, captions = countdown_layout(values, scale)
+    card_width, card_height = round(CARD_WIDTH * scale), round(CARD_HEIGHT * scale)
+    half = card_height // 2
+    radius = round(5 * scale)
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}">',
+        f'<rect width="{width}" height="{height}" fill="{THEME["bg"]}"/>',
+    ]
+    for x, digit in cards:
+        parts.append(
+            f'<rect x="{x}" y="0" width="{card_width}" height="{half}" rx="{radius}" fill="{THEME["button_bg"]}"/>'
+            f'<rect x="{x}" y="{half}" width="{card_width}" height="{card_height - half}" rx="{radius}" fill="#333333"/>'
+            f'<text x="{x + card_width / 2}" y="{half}" fill="{THEME["fg"]}" font-family="Consolas, monospace" '
+            f'font-weight="bold" font-size="{round(56 * scale)}" text-anchor="middle" '
+            f'dominant-baseline="central">{digit}</text>'
+        )
+    caption_y = round((CARD_HEIGHT + CAPTION_PAD + CAPTION_HEIGHT / 2) * scale)
+    for x, unit in captions:
+        parts.append(
+            f'<text x="{x}" y="{caption_y}" fill="{THEME["text"]}" font-family="Arial, sans-serif" '
+            f'font-weight="bold" font-size="{round(13 * scale)}" text-anchor="middle" '
+            f'dominant-baseline="central">{unit}</text>'
+        )
+    parts.append("</svg>")
+    return "".join(parts)
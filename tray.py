@@ -0,0 +1,139 @@
+"""
+Tray-only Doom Counter: the remaining time as a small rendered tray icon and
+tooltip, with no Tk window at all.
+
+The icon is redrawn on pystray's setup thread and only when its text
+changes, which is once a day, hour, minute or second depending on how far
+away the doom date is. Rendered badges are memoised by render_badge.
+"""
+import argparse
+import os
+import sys
+import threading
+from datetime import datetime, timedelta
+
+from countdown import DATE_FORMAT, DOOMSDAY_TEXT, remaining_seconds, split_remaining
+from datefile import default_path, load_doom_entry
+from recurrence import ROLLOVER_SECONDS, current_doom_date
+from render import render_badge
+
+
+def tray_state(remaining):
+    """
+    Returns (icon text, tooltip, resolution) for a number of seconds left.
+    The resolution is how often, in seconds, either text can change; None
+    once the doom date has passed.
+    """
+    if remaining <= 0:
+        return "!", DOOMSDAY_TEXT, None
+    days, hours, minutes, seconds = split_remaining(remaining)
+    if days:
+        return f"{days}d", f"DOOM: {days}d {hours:02d}h", 3600
+    if hours:
+        return f"{hours}h", f"DOOM: {hours}h {minutes:02d}m", 60
+    if minutes:
+        return f"{minutes}m", f"DOOM: {minutes}m", 60
+    return f"{seconds}s", f"DOOM: {seconds}s", 1
+
+
+class TrayCounter:
+    """
+    Owns the pystray icon and the thread that keeps it current. A recurring
+    `schedule` moves the doom date on once it has been reached.
+    """
+    def __init__(self, doom_date, size=64, schedule=None):
+        self.doom_date = doom_date
+        self.schedule = schedule
+        self.size = size
+        self.redraws = 0
+        self.icon = None
+        self._stop = threading.Event()
+
+    def run(self):
+        """Shows the icon and blocks until Quit is chosen."""
+        import pystray # Only needed here; a plain import so PyInstaller bundles it
+        self.icon = pystray.Icon(
+            "DoomCounter",
+            title="Doom Counter",
+            menu=pystray.Menu(
+                pystray.MenuItem(lambda item: f"Doom date: {self.doom_date.strftime(DATE_FORMAT)}", None, enabled=False),
+                pystray.MenuItem("Quit", self.stop)
+            )
+        )
+        # pystray runs setup on its own thread, which becomes the update loop
+        self.icon.run(setup=self._update_loop)
+
+    def stop(self, *args):
+        self._stop.set()
+        if self.icon is not None:
+            self.icon.stop()
+
+    def _update_loop(self, icon):
+        shown_text = shown_tooltip = None
+        recurs = self.schedule is not None and self.schedule.kind != "once"
+        while not self._stop.is_set():
+            next_date = current_doom_date(self.doom_date, self.schedule)
+            if next_date != self.doom_date:
+                self.doom_date = next_date
+                icon.update_menu()
+            remaining = remaining_seconds(self.doom_date)
+            text, tooltip, resolution = tray_state(remaining)
+            if text != shown_text:
+                icon.icon = render_badge(text, self.size)
+                shown_text = text
+                self.redraws += 1
+            if tooltip != shown_tooltip:
+                icon.title = tooltip
+                shown_tooltip = tooltip
+            if not icon.visible:
+                icon.visible = True
+            if resolution is None:
+                if not recurs:
+                    break
+                # Check again when the date is due to move on
+                self._stop.wait(max(ROLLOVER_SECONDS + remaining, 1) + 0.005)
+                continue
+            # Sleep until the shown value ticks over, aligned to the doom date
+            self._stop.wait((remaining % resolution or resolution) + 0.005)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Doomsday countdown as a tray icon")
+    parser.add_argument(
+        "--date",
+        metavar="'YYYY-MM-DD HH:MM:SS'",
+        help="count down to this date instead of the one in the date file"
+    )
+    parser.add_argument(
+        "--date-file",
+        metavar="PATH",
+        help="file holding the doom date (default: as for main.py)"
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        default=64,
+        metavar="PIXELS",
+        help="size the icon is rendered at"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    schedule = None
+    if args.date:
+        try:
+            doom_date = datetime.strptime(args.date, DATE_FORMAT)
+        except ValueError:
+            sys.exit(f"Invalid date/time format, use YYYY-MM-DD HH:MM:SS: {args.date}")
+    else:
+        date_file = os.path.abspath(args.date_file) if args.date_file else default_path()
+        doom_date, schedule = load_doom_entry(date_file)
+        if doom_date is None:
+            doom_date, schedule = datetime.now() + timedelta(days=7), None
+    TrayCounter(doom_date, size=args.size, schedule=schedule).run()
+
+
+if __name__ == "__main__":
+    main()
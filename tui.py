@@ -0,0 +1,213 @@
+"""
+Terminal renderer for the Doom Counter, for headless servers and tmux panes.
+
+Draws the countdown in place below the cursor and afterwards rewrites only
+the character cells that changed, using relative ANSI cursor moves, so the
+screen is never cleared and scrollback above the counter is left alone.
+Needs nothing beyond the standard library and countdown.py.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+from countdown import DATE_FORMAT, DOOMSDAY_TEXT, countdown_values, remaining_seconds
+from datefile import default_path, load_doom_entry
+from recurrence import current_doom_date
+
+# Three-column block glyphs, five rows high
+GLYPHS = {
+    "0": ["███", "█ █", "█ █", "█ █", "███"],
+    "1": [" █ ", "██ ", " █ ", " █ ", "███"],
+    "2": ["███", "  █", "███", "█  ", "███"],
+    "3": ["███", "  █", "███", "  █", "███"],
+    "4": ["█ █", "█ █", "███", "  █", "  █"],
+    "5": ["███", "█  ", "███", "  █", "███"],
+    "6": ["███", "█  ", "███", "█ █", "███"],
+    "7": ["███", "  █", "  █", "  █", "  █"],
+    "8": ["███", "█ █", "███", "█ █", "███"],
+    "9": ["███", "█ █", "███", "  █", "███"],
+}
+GLYPH_HEIGHT = 5
+UNITS = ("DAYS", "HOURS", "MINUTES", "SECONDS")
+
+# Theme colours of the window, as 24-bit ANSI foregrounds
+ACCENT = "\x1b[38;2;255;77;77m"
+TEXT = "\x1b[38;2;255;255;255m"
+RESET = "\x1b[0m"
+
+
+def build_frame(doom_date_str, values, doomsday=False, big=True):
+    """
+    Lays the countdown out as a list of text rows:
+    the doom date, the digits and the unit captions (or one compact line).
+    """
+    if not big:
+        days, hours, minutes, seconds = values
+        line = DOOMSDAY_TEXT if doomsday else f"{days}d {hours}:{minutes}:{seconds}"
+        return [f"DOOM: {line}"]
+
+    digit_rows = [""] * GLYPH_HEIGHT
+    captions = ""
+    for value, unit in zip(values, UNITS):
+        start = len(digit_rows[0])
+        for digit in value:
+            for row in range(GLYPH_HEIGHT):
+                digit_rows[row] += GLYPHS[digit][row] + " "
+        width = len(digit_rows[0]) - start
+        captions += unit[:width - 1].center(width)
+        for row in range(GLYPH_HEIGHT):
+            digit_rows[row] += "  "
+        captions += "  "
+    status = DOOMSDAY_TEXT if doomsday else ""
+    return [f"DOOM DATE: {doom_date_str}", *digit_rows, captions, status]
+
+
+class TerminalRenderer:
+    """
+    Keeps the last frame written and emits only the changed runs of cells.
+
+    The frame is drawn once with newlines, leaving the cursor on the line
+    below it; each update then moves up to a changed row, across to the
+    changed column, writes the run and moves back down again.
+    """
+    def __init__(self, stream=sys.stdout, color=True):
+        self.stream = stream
+        self.color = color
+        self.rows = None
+        self.cells_written = 0
+
+    def _style(self, index):
+        if not self.color:
+            return "", ""
+        # Digits and the doomsday line in the accent colour, labels in white
+        return (TEXT if index == 0 or index == GLYPH_HEIGHT + 1 else ACCENT), RESET
+
+    def draw(self, rows):
+        if self.rows is None or len(rows) != len(self.rows):
+            self._draw_full(rows)
+        else:
+            self._draw_changes(rows)
+        self.stream.flush()
+
+    def _draw_full(self, rows):
+        out = []
+        if self.rows is not None:
+            # Layout changed (e.g. days gained a digit); redraw over the old frame
+            out.append(f"\x1b[{len(self.rows)}F")
+        for index, row in enumerate(rows):
+            start, end = self._style(index)
+            out.append(f"{start}{row}{end}\x1b[K\n")
+            self.cells_written += len(row)
+        self.stream.write("".join(out))
+        self.rows = list(rows)
+
+    def _draw_changes(self, rows):
+        out = []
+        height = len(rows)
+        for index, (old, new) in enumerate(zip(self.rows, rows)):
+            if old == new:
+                continue
+            start, end = self._style(index)
+            up = height - index
+            out.append(f"\x1b[{up}F")
+            if len(new) < len(old):
+                new_padded = new.ljust(len(old))
+            else:
+                new_padded = new
+            old_padded = old.ljust(len(new_padded))
+            col = 0
+            while col < len(new_padded):
+                if new_padded[col] == old_padded[col]:
+                    col += 1
+                    continue
+                run_end = col
+                while run_end < len(new_padded) and new_padded[run_end] != old_padded[run_end]:
+                    run_end += 1
+                out.append(f"\x1b[{col + 1}G{start}{new_padded[col:run_end]}{end}")
+                self.cells_written += run_end - col
+                col = run_end
+            out.append(f"\x1b[{up}E")
+        if out:
+            self.stream.write("".join(out))
+        self.rows = list(rows)
+
+    def show_cursor(self, visible):
+        self.stream.write("\x1b[?25h" if visible else "\x1b[?25l")
+        self.stream.flush()
+
+
+def run(doom_date, big=True, color=True, stream=sys.stdout, schedule=None):
+    """
+    Renders the countdown until interrupted, sleeping until each wall-clock
+    second boundary so an idle counter costs one wakeup per second. A
+    recurring `schedule` moves the doom date on once it has been reached,
+    as in the window.
+    """
+    recurs = schedule is not None and schedule.kind != "once"""
+    renderer = TerminalRenderer(stream, color=color)
+    doom_date_str = doom_date.strftime(DATE_FORMAT)
+    renderer.show_cursor(False)
+    try:
+        while True:
+            next_date = current_doom_date(doom_date, schedule)
+            if next_date != doom_date:
+                doom_date, doom_date_str = next_date, next_date.strftime(DATE_FORMAT)
+            remaining = remaining_seconds(doom_date)
+            renderer.draw(build_frame(doom_date_str, countdown_values(remaining), remaining <= 0, big))
+            if remaining <= 0 and not recurs:
+                # Nothing will change any more; stay on screen until interrupted
+                while True:
+                    time.sleep(3600)
+            time.sleep(1 - time.time() % 1 + 0.005)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        renderer.show_cursor(True)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Doomsday countdown in the terminal")
+    parser.add_argument(
+        "--date",
+        metavar="'YYYY-MM-DD HH:MM:SS'",
+        help="count down to this date instead of the one in the date file"
+    )
+    parser.add_argument(
+        "--date-file",
+        metavar="PATH",
+        help="file holding the doom date (default: as for main.py)"
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="a single line instead of large digits"
+    )
+    parser.add_argument(
+        "--no-color",
+        action="store_true",
+        help="plain text without ANSI colours"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    schedule = None
+    if args.date:
+        try:
+            doom_date = datetime.strptime(args.date, DATE_FORMAT)
+        except ValueError:
+            sys.exit(f"Invalid date/time format, use YYYY-MM-DD HH:MM:SS: {args.date}")
+    else:
+        date_file = os.path.abspath(args.date_file) if args.date_file else default_path()
+        doom_date, schedule = load_doom_entry(date_file)
+        if doom_date is None:
+            doom_date, schedule = datetime.now() + timedelta(days=7), None
+    color = not args.no_color and "NO_COLOR" not in os.environ and sys.stdout.isatty()
+    run(doom_date, big=not args.compact, color=color, schedule=schedule)
+
+
+if __name__ == "__main__":
+    main()